@@ -0,0 +1,48 @@
+"""
+Admin for models using ``Eduvix.soft_delete``.
+
+Their default managers hide soft-deleted rows, so the stock ``ModelAdmin``
+could neither show nor restore them. ``SoftDeleteAdmin`` lists every row via
+``all_objects``, filters on deletion state and adds soft delete / restore
+actions. The actions save row by row so that signals (cache versions,
+leaderboards) fire.
+"""
+from django.contrib import admin
+
+
+class DeletedFilter(admin.SimpleListFilter):
+    title = "deleted"
+    parameter_name = "deleted"
+
+    def lookups(self, request, model_admin):
+        return (("no", "No"), ("yes", "Yes"))
+
+    def queryset(self, request, queryset):
+        if self.value() == "no":
+            return queryset.filter(deleted_at__isnull=True)
+        if self.value() == "yes":
+            return queryset.filter(deleted_at__isnull=False)
+        return queryset
+
+
+class SoftDeleteAdmin(admin.ModelAdmin):
+    list_display = ("__str__", "deleted_at")
+    list_filter = (DeletedFilter,)
+    actions = ("soft_delete_selected", "restore_selected")
+
+    def get_queryset(self, request):
+        queryset = self.model.all_objects.all()
+        ordering = self.get_ordering(request)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
+    @admin.action(description="Soft delete selected %(verbose_name_plural)s")
+    def soft_delete_selected(self, request, queryset):
+        for obj in queryset.filter(deleted_at__isnull=True):
+            obj.soft_delete()
+
+    @admin.action(description="Restore selected %(verbose_name_plural)s")
+    def restore_selected(self, request, queryset):
+        for obj in queryset.filter(deleted_at__isnull=False):
+            obj.restore()
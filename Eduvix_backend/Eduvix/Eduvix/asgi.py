@@ -14,3 +14,10 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Eduvix.settings')
 
 application = get_asgi_application()
+
+# Build the global leaderboard while the worker starts, not in its first request.
+from django.conf import settings  # noqa: E402
+
+if getattr(settings, 'LEADERBOARD_WARM_UP', True):
+    from accounts.leaderboard import leaderboards
+    leaderboards.warm_up()
@@ -0,0 +1,245 @@
+"""
+HTTP caching for read-heavy API views.
+
+``ConditionalGetMixin`` derives a weak ETag from cheap model version stamps
+(``MAX(updated_at)`` and ``COUNT(*)``) and answers a matching
+``If-None-Match`` with 304 before the view serializes anything.
+
+``SharedResponseCacheMiddleware`` stores rendered responses of anonymous GET
+requests for views that set ``shared_cache_timeout``. Cache keys embed a
+version number per model listed in the view's ``cache_models``; saving or
+deleting an instance of a tracked model bumps that version, so stale entries
+are never read again and simply age out.
+
+Apps opt their models in from ``AppConfig.ready()``::
+
+    http_cache.track_models(Course, Category)
+    http_cache.track_models(User, fields=("username",))
+
+With ``fields``, saves limited by ``update_fields`` to other fields (e.g. the
+``last_login`` write on every login) leave the version alone.
+
+Hits, misses and 304s are counted in the cache; see ``manage.py
+http_cache_stats``. Point the ``default`` cache at a shared backend (Redis,
+Memcached) in production so all workers see the same entries.
+"""
+import hashlib
+import time
+
+from django.core.cache import cache
+from django.db.models import Count, Max
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from rest_framework import status
+
+VERSION_KEY = "httpcache:version:%s"
+RESPONSE_KEY = "httpcache:response:%s"
+STAT_KEY = "httpcache:stats:%s"
+STATS = ("hit", "miss", "not_modified")
+
+# Model label -> fields whose changes matter, or None for any change.
+_tracked_labels = {}
+
+
+def _label(model):
+    if isinstance(model, str):
+        return model.lower()
+    return model._meta.label_lower
+
+
+def record(stat):
+    key = STAT_KEY % stat
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def get_stats():
+    values = cache.get_many([STAT_KEY % stat for stat in STATS])
+    stats = {stat: values.get(STAT_KEY % stat, 0) for stat in STATS}
+    lookups = stats["hit"] + stats["miss"]
+    stats["hit_ratio"] = stats["hit"] / lookups if lookups else 0.0
+    return stats
+
+
+def reset_stats():
+    cache.delete_many([STAT_KEY % stat for stat in STATS])
+
+
+def get_versions(models):
+    keys = [VERSION_KEY % _label(model) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Seed with a timestamp so an evicted counter never restarts at a
+            # value that old entries were stored under.
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(model):
+    key = VERSION_KEY % _label(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), timeout=None)
+
+
+def _invalidate(sender, update_fields=None, **kwargs):
+    label = sender._meta.label_lower
+    if label not in _tracked_labels:
+        return
+    fields = _tracked_labels[label]
+    if fields is None or update_fields is None or not fields.isdisjoint(update_fields):
+        bump_version(sender)
+
+
+def track_models(*models, fields=None):
+    for model in models:
+        _tracked_labels[_label(model)] = None if fields is None else frozenset(fields)
+
+
+post_save.connect(_invalidate, dispatch_uid="http_cache_invalidate_save")
+post_delete.connect(_invalidate, dispatch_uid="http_cache_invalidate_delete")
+
+
+def queryset_stamp(queryset, *related):
+    """
+    ``MAX(updated_at)`` and ``COUNT(*)`` of ``queryset``, plus the latest value
+    of each ``related`` timestamp (e.g. ``"teacher__user__updated_at"``) for
+    responses that embed fields of forward relations.
+    """
+    fields = ("updated_at",) + related
+    stamp = queryset.order_by().aggregate(
+        total=Count("pk"), **{f"last{i}": Max(field) for i, field in enumerate(fields)}
+    )
+    lasts = [stamp[f"last{i}"] for i in range(len(fields))]
+    return tuple(last.isoformat() if last else "" for last in lasts) + (stamp["total"],)
+
+
+def _etag_matches(request, etag):
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header or not etag:
+        return False
+    if header.strip() == "*":
+        return True
+    # Weak comparison: strip the W/ prefix on both sides.
+    candidates = {tag.removeprefix("W/") for tag in parse_etags(header)}
+    return etag.removeprefix("W/") in candidates
+
+
+def is_anonymous(request):
+    return "access_token" not in request.COOKIES and "HTTP_AUTHORIZATION" not in request.META
+
+
+class NotModified(Exception):
+    def __init__(self, etag):
+        self.etag = etag
+
+
+class ConditionalGetMixin:
+    """
+    Views implement ``get_etag_stamps()`` returning hashable values that
+    change whenever the response would, typically via ``queryset_stamp()``.
+    """
+    cache_models = ()
+    shared_cache_timeout = None
+    cache_control = {"public": True, "max_age": 0, "must_revalidate": True}
+
+    def get_etag_stamps(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+    def get_etag(self, request, *args, **kwargs):
+        stamps = self.get_etag_stamps(request, *args, **kwargs)
+        if stamps is None:
+            return None
+        raw = "|".join([
+            request.get_full_path(),
+            request.META.get("HTTP_ACCEPT", ""),
+            repr(tuple(stamps)),
+        ])
+        return 'W/"%s"' % hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.etag = None
+        if request.method in ("GET", "HEAD"):
+            self.etag = self.get_etag(request, *args, **kwargs)
+            if _etag_matches(request, self.etag):
+                raise NotModified(self.etag)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            # Imported here so apps can call track_models() from ready()
+            # without loading DRF's serializer stack at startup.
+            from rest_framework.response import Response
+            record("not_modified")
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": exc.etag})
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        etag = getattr(self, "etag", None)
+        if etag and response.status_code == status.HTTP_200_OK:
+            response["ETag"] = etag
+            patch_cache_control(response, **self.cache_control)
+        return response
+
+
+class SharedResponseCacheMiddleware:
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        key = getattr(request, "_shared_cache_key", None)
+        if (
+            key is not None
+            and response.status_code == status.HTTP_200_OK
+            and not response.cookies
+            and not response.has_header("Set-Cookie")
+            and not getattr(response, "streaming", False)
+        ):
+            cache.set(key, response, request._shared_cache_timeout)
+            response["X-Cache"] = "MISS"
+        return response
+
+    def _cache_key(self, request, view_cls):
+        versions = get_versions(view_cls.cache_models)
+        raw = "|".join([
+            request.method,
+            request.get_full_path(),
+            request.META.get("HTTP_ACCEPT", ""),
+            repr(versions),
+        ])
+        return RESPONSE_KEY % hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_cls = getattr(view_func, "cls", None)
+        timeout = getattr(view_cls, "shared_cache_timeout", None)
+        if not timeout or request.method not in ("GET", "HEAD") or not is_anonymous(request):
+            return None
+
+        key = self._cache_key(request, view_cls)
+        response = cache.get(key)
+        if response is None:
+            record("miss")
+            request._shared_cache_key = key
+            request._shared_cache_timeout = timeout
+            return None
+
+        record("hit")
+        etag = response.get("ETag")
+        if _etag_matches(request, etag):
+            record("not_modified")
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+        response["X-Cache"] = "HIT"
+        return response
@@ -0,0 +1,54 @@
+"""
+JSON renderer backed by orjson.
+
+Drop-in replacement for DRF's ``JSONRenderer``; falls back to it when orjson
+is not installed, when a pretty-printed response is requested, or when the
+payload holds something orjson cannot encode (e.g. integers above 64 bits).
+"""
+from decimal import Decimal
+
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class FallbackJSONEncoder(JSONEncoder):
+    """DRF's encoder, emitting Decimals the way the orjson path does."""
+
+    def default(self, obj):
+        # Decimals follow DRF's COERCE_DECIMAL_TO_STRING default.
+        if isinstance(obj, Decimal):
+            return str(obj)
+        return super().default(obj)
+
+
+_default = FallbackJSONEncoder().default
+
+
+if orjson is not None:
+    ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+class FastJSONRenderer(JSONRenderer):
+    encoder_class = FallbackJSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Keep DRF's guarantee that the output is a strict JavaScript subset.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
@@ -0,0 +1,125 @@
+"""
+Declarative retention policies for tables that grow without bound.
+
+Each app lists its policies in a ``retention.py`` module::
+
+    from Eduvix import retention
+
+    retention.register(
+        Notification,
+        age_field="created_at",
+        max_age=timedelta(days=90),
+        condition=Q(is_read=True),
+    )
+
+``manage.py purge_expired`` discovers those modules and runs every policy.
+Expired rows are walked in primary-key order, ``chunk_size`` at a time, and
+each chunk is (optionally) appended to a gzipped JSONL archive and deleted in
+its own short transaction, with a pause between chunks. Old rows sit at the
+low end of the primary key, so the keyset scan finds them without an extra
+index on the age column.
+"""
+import gzip
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+
+@dataclass
+class RetentionPolicy:
+    model: type
+    age_field: str
+    max_age: timedelta
+    condition: models.Q = None
+    archive: bool = False
+
+    @property
+    def label(self):
+        return self.model._meta.label
+
+    def expired(self, now=None):
+        now = now or timezone.now()
+        # The base manager sees soft-deleted rows that default managers hide.
+        queryset = self.model._base_manager.filter(**{f"{self.age_field}__lt": now - self.max_age})
+        if self.condition is not None:
+            queryset = queryset.filter(self.condition)
+        return queryset
+
+    def archive_path(self, archive_dir, now):
+        stamp = now.strftime("%Y%m%dT%H%M%S")
+        return os.path.join(archive_dir, f"{self.model._meta.label_lower}-{stamp}.jsonl.gz")
+
+
+_registry = []
+
+
+def register(model, **options):
+    policy = RetentionPolicy(model, **options)
+    _registry.append(policy)
+    return policy
+
+
+def get_policies():
+    autodiscover_modules("retention")
+    return list(_registry)
+
+
+def _write_archive(archive, rows):
+    for row in rows:
+        archive.write(json.dumps(row, cls=DjangoJSONEncoder).encode())
+        archive.write(b"\n")
+
+
+def purge(policy, chunk_size=1000, pause=0.1, archive_dir=None, now=None):
+    """
+    Delete (and archive, if the policy asks for it) rows older than the
+    policy allows. Returns the number of rows removed from the policy's table.
+    """
+    now = now or timezone.now()
+    expired = policy.expired(now)
+    pk_name = policy.model._meta.pk.attname
+    archive = None
+    removed = 0
+    last_pk = None
+
+    if policy.archive:
+        if archive_dir is None:
+            raise ValueError(f"{policy.label} needs an archive directory")
+        os.makedirs(archive_dir, exist_ok=True)
+
+    try:
+        while True:
+            chunk = expired.order_by("pk")
+            if last_pk is not None:
+                chunk = chunk.filter(pk__gt=last_pk)
+            pks = list(chunk.values_list("pk", flat=True)[:chunk_size])
+            if not pks:
+                break
+            last_pk = pks[-1]
+
+            with transaction.atomic():
+                rows = expired.filter(pk__in=pks)
+                if policy.archive:
+                    if archive is None:
+                        archive = gzip.open(policy.archive_path(archive_dir, now), "ab")
+                    _write_archive(archive, rows.order_by(pk_name).values())
+                    archive.flush()
+                _, per_model = rows.delete()
+            removed += per_model.get(policy.label, 0)
+
+            if len(pks) < chunk_size:
+                break
+            if pause:
+                time.sleep(pause)
+    finally:
+        if archive is not None:
+            archive.close()
+
+    return removed
@@ -0,0 +1,56 @@
+"""
+Lean read-only serializers for hot list endpoints.
+
+``ValuesSerializer`` skips DRF's per-field ``to_representation`` calls and
+lets the database hand back plain dicts through ``QuerySet.values()``. Values
+are emitted as the driver returns them (datetimes, decimals, ...), which the
+``FastJSONRenderer`` encodes directly.
+
+    class CourseListSerializer(ValuesSerializer):
+        fields = ("id", "title", "price", ("teacher", "teacher__user__username"))
+
+    CourseListSerializer(Course.objects.filter(...)).data
+
+Values computed in Python (thumbnail URLs, say) are added to the fetched rows
+in ``finalize()``.
+"""
+from django.db.models import F
+
+
+class ValuesSerializer:
+    # Each entry is either a field name or an ``(output_name, lookup)`` pair.
+    fields = ()
+
+    def __init__(self, instance=None, many=True):
+        self.instance = instance
+        self.many = many
+
+    @classmethod
+    def get_values_args(cls):
+        names = []
+        aliases = {}
+        for field in cls.fields:
+            if isinstance(field, tuple):
+                name, lookup = field
+                aliases[name] = F(lookup)
+            else:
+                names.append(field)
+        return names, aliases
+
+    @classmethod
+    def as_values(cls, queryset):
+        names, aliases = cls.get_values_args()
+        return queryset.values(*names, **aliases)
+
+    def finalize(self, rows):
+        return rows
+
+    @property
+    def data(self):
+        rows = self.as_values(self.instance)
+        if self.many:
+            return self.finalize(list(rows))
+        row = rows.first()
+        if row is None:
+            return None
+        return self.finalize([row])[0]
@@ -31,15 +31,20 @@ ALLOWED_HOSTS = []
 # Application definition
 
 INSTALLED_APPS = [
-    'django.contrib.admin',
+    # SimpleAdminConfig skips admin autodiscovery at startup; Eduvix/urls.py
+    # runs it when the URLconf is first loaded.
+    'django.contrib.admin.apps.SimpleAdminConfig',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'rest_framework',
-    'rest_framework_simplejwt',
+    # rest_framework_simplejwt is used as a library only: installed as an app
+    # its models module imports django.test (and unittest) on every startup.
     'accounts',
+    'courses',
+    'library',
     'corsheaders',
 ]
 
@@ -52,6 +57,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'corsheaders.middleware.CorsMiddleware',
+    'Eduvix.http_cache.SharedResponseCacheMiddleware',
 ]
 
 CORS_ALLOWED_ORIGINS = [
@@ -95,6 +101,13 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # SQLite ignores SELECT ... FOR UPDATE; taking the write lock when the
+        # transaction starts keeps concurrent checkouts from failing with
+        # "database is locked" instead of waiting.
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+            'timeout': 20,
+        },
     }
 }
 
@@ -135,11 +148,47 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+MEDIA_URL = 'media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Thumbnails of covers, photos and avatars (Eduvix/thumbnails.py). They are
+# only generated when Pillow is installed; otherwise clients get the originals.
+THUMBNAIL_CACHE_DIR = BASE_DIR / 'thumbnails'
+THUMBNAIL_CACHE_MAX_BYTES = 512 * 1024 * 1024
+THUMBNAIL_MAX_SOURCE_BYTES = 20 * 1024 * 1024
+# Image URLs on these hosts are fetched and thumbnailed like local media.
+THUMBNAIL_REMOTE_HOSTS = []
+
+# Student leaderboards are kept in each process (accounts/leaderboard.py) and
+# follow a change log in the default cache, which should be shared by all
+# workers. WARM_UP builds the global board when a worker starts. A board is
+# reloaded in the background once it is MAX_AGE seconds old, which picks up
+# writes that bypass the model signals.
+LEADERBOARD_WARM_UP = True
+LEADERBOARD_MAX_AGE = 60 * 10
+# Course leaderboards kept per process; the least recently read go first.
+LEADERBOARD_MAX_BOARDS = 100
+
+# Share of each course sale booked as platform commission (Teacher.total_commission).
+COURSE_COMMISSION_RATE = '0.00'
+
+# Gzipped JSONL archives written by `manage.py purge_expired`.
+RETENTION_ARCHIVE_DIR = BASE_DIR / 'archives'
+
 AUTH_USER_MODEL = "accounts.User"  
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "accounts.authentication.JWTCookieAuthentication",
+    ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "Eduvix.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "Eduvix.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ),
      'DEFAULT_THROTTLE_CLASSES': [
         'rest_framework.throttling.ScopedRateThrottle',
@@ -0,0 +1,47 @@
+"""
+Soft-delete support for models with a nullable ``deleted_at`` column.
+
+Models mix in ``SoftDeleteMixin`` and declare ``objects = SoftDeleteManager()``
+(only live rows, so queries carry ``deleted_at IS NULL`` and can use the
+partial indexes defined on that predicate) followed by ``all_objects`` for
+the rare code that needs deleted rows too. Related-object access still goes
+through Django's unfiltered base manager. Rows are hard-deleted once expired
+by the retention policies in each app's ``retention.py``.
+
+Rows are soft-deleted one at a time with the instance's ``soft_delete()``,
+so ``post_save`` handlers (HTTP cache versions, leaderboards) see the change.
+There is deliberately no bulk queryset variant.
+"""
+from django.db import models
+from django.utils import timezone
+
+ALIVE = models.Q(deleted_at__isnull=True)
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+
+    def alive(self):
+        return self.filter(ALIVE)
+
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+
+    def get_queryset(self):
+        return super().get_queryset().alive()
+
+
+class SoftDeleteMixin:
+
+    def _save_deleted_at(self):
+        fields = ["deleted_at"]
+        if any(field.name == "updated_at" for field in self._meta.concrete_fields):
+            fields.append("updated_at")
+        self.save(update_fields=fields)
+
+    def soft_delete(self):
+        self.deleted_at = timezone.now()
+        self._save_deleted_at()
+
+    def restore(self):
+        self.deleted_at = None
+        self._save_deleted_at()
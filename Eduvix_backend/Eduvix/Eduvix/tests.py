@@ -0,0 +1,263 @@
+import datetime
+import gzip
+import json
+import os
+import shutil
+import tempfile
+import time
+import uuid
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+
+from accounts.models import AuditLog, Notification, User
+from library.models import Book
+from . import retention, thumbnails
+from .parsers import FastJSONParser
+from .renderers import FastJSONRenderer
+
+
+class FastJSONRendererTests(SimpleTestCase):
+    data = {
+        "price": Decimal("10.50"),
+        "created_at": datetime.datetime(2026, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc),
+        "day": datetime.date(2026, 1, 2),
+        "id": uuid.UUID(int=1),
+        "note": "a b",
+    }
+    expected = (
+        b'{"price":"10.50","created_at":"2026-01-02T03:04:05.123456Z","day":"2026-01-02",'
+        b'"id":"00000000-0000-0000-0000-000000000001","note":"a\\u2028b"}'
+    )
+
+    def render(self, data, media_type="application/json"):
+        return FastJSONRenderer().render(data, media_type, {})
+
+    def test_orjson_output(self):
+        self.assertEqual(self.render(self.data), self.expected)
+
+    def test_fallback_without_orjson(self):
+        with mock.patch("Eduvix.renderers.orjson", None):
+            self.assertEqual(self.render(self.data), self.expected)
+
+    def test_fallback_for_values_orjson_rejects(self):
+        rendered = self.render({**self.data, "big": 2 ** 70})
+        self.assertEqual(rendered, self.expected[:-1] + b',"big":%d}' % 2 ** 70)
+
+    def test_fallback_when_indented(self):
+        rendered = self.render(self.data, "application/json; indent=2")
+        self.assertIn(b'"price": "10.50"', rendered)
+        self.assertIn(b'"created_at": "2026-01-02T03:04:05.123456Z"', rendered)
+
+
+class FastJSONParserTests(SimpleTestCase):
+
+    def parse(self, body, encoding="utf-8"):
+        return FastJSONParser().parse(BytesIO(body), "application/json", {"encoding": encoding})
+
+    def test_parses_utf8(self):
+        self.assertEqual(self.parse('{"name": "Zoë"}'.encode()), {"name": "Zoë"})
+
+    def test_fallback_for_other_encodings(self):
+        self.assertEqual(self.parse('{"name": "Zoë"}'.encode("latin-1"), "latin-1"), {"name": "Zoë"})
+
+    def test_fallback_without_orjson(self):
+        with mock.patch("Eduvix.parsers.orjson", None):
+            self.assertEqual(self.parse(b'{"n": 1.5}'), {"n": 1.5})
+
+    def test_invalid_json_is_a_parse_error(self):
+        with self.assertRaises(ParseError):
+            self.parse(b"{nope")
+        with mock.patch("Eduvix.parsers.orjson", None), self.assertRaises(ParseError):
+            self.parse(b"{nope")
+
+
+class ThumbnailTests(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.addCleanup(shutil.rmtree, cache_dir)
+        settings = override_settings(
+            MEDIA_ROOT=media_root, THUMBNAIL_CACHE_DIR=cache_dir, THUMBNAIL_REMOTE_HOSTS=["img.example.com"],
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        patcher = mock.patch.object(thumbnails, "_cache", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.media_root = media_root
+
+        from PIL import Image
+        Image.new("RGB", (800, 600), "red").save(f"{media_root}/cover.png")
+
+    def book(self, cover):
+        return Book.objects.create(title="Book", author="A", cover=cover, is_published=True)
+
+    def test_local_image_is_thumbnailed(self):
+        book = self.book("cover.png")
+        url = thumbnails.thumbnail_url("book", book.pk, book.cover)
+        self.assertTrue(url.startswith(f"/api/thumbnails/book/{book.pk}/small/?v="))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertIn("immutable", response["Cache-Control"])
+
+    def test_unfetchable_sources_keep_their_url(self):
+        for source in ("https://elsewhere.example.com/a.png", "//elsewhere.example.com/a.png", "missing.png"):
+            with self.subTest(source=source):
+                self.assertEqual(thumbnails.thumbnail_url("book", 1, source), thumbnails.original_url(source))
+        self.assertTrue(thumbnails.thumbnail_url("book", 1, "https://img.example.com/a.png").startswith("/api/"))
+
+    def test_view_does_not_redirect_off_site(self):
+        for source in ("https://elsewhere.example.com/a.png", "//elsewhere.example.com/a.png", "/\\elsewhere.example.com"):
+            with self.subTest(source=source):
+                book = self.book(source)
+                response = self.client.get(f"/api/thumbnails/book/{book.pk}/small/")
+                self.assertEqual(response.status_code, 404)
+
+    def test_view_redirects_to_local_original_it_cannot_resize(self):
+        with open(f"{self.media_root}/broken.png", "wb") as f:
+            f.write(b"not an image")
+        book = self.book("broken.png")
+        with self.assertLogs("Eduvix.thumbnails", "WARNING"):
+            response = self.client.get(f"/api/thumbnails/book/{book.pk}/small/")
+        self.assertRedirects(response, "/media/broken.png", fetch_redirect_response=False)
+
+    def test_local_paths_stay_inside_media_root(self):
+        root = os.path.realpath(self.media_root)
+        self.assertEqual(thumbnails._local_path("cover.png"), f"{root}/cover.png")
+        self.assertEqual(thumbnails._local_path("/media/cover.png"), f"{root}/cover.png")
+        outside = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, outside)
+        os.symlink(outside, f"{self.media_root}/link")
+        for source in ("../secret.png", "/media/../../secret.png", "a/../../secret.png",
+                       "/etc/passwd", "link/secret.png", "file:///etc/passwd"):
+            with self.subTest(source=source):
+                self.assertIsNone(thumbnails._local_path(source))
+
+
+class ThumbnailCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def age(self, cache, key, seconds):
+        then = time.time() - seconds
+        os.utime(cache.path(key), (then, then))
+
+    def keys(self, cache):
+        return sorted(os.path.basename(path)[:-4] for _, _, path in cache._files())
+
+    def test_least_recently_used_files_are_evicted(self):
+        cache = thumbnails.ThumbnailCache(self.directory, max_bytes=250)
+        cache.put("aa1", b"x" * 100)
+        cache.put("bb1", b"x" * 100)
+        self.age(cache, "aa1", 3 * 60 * 60)
+        self.age(cache, "bb1", 2 * 60 * 60)
+        self.assertIsNotNone(cache.get("aa1"))
+        cache.put("cc1", b"x" * 100)
+        self.assertEqual(self.keys(cache), ["aa1", "cc1"])
+        self.assertIsNone(cache.get("bb1"))
+
+    def test_writes_of_other_processes_count_towards_the_cap(self):
+        first = thumbnails.ThumbnailCache(self.directory, max_bytes=250)
+        second = thumbnails.ThumbnailCache(self.directory, max_bytes=250)
+        first.put("aa1", b"x" * 100)
+        second.put("bb1", b"x" * 100)
+        self.age(first, "aa1", 60)
+        first._counted_at -= thumbnails.RECOUNT_INTERVAL
+        first.put("cc1", b"x" * 100)
+        self.assertEqual(self.keys(first), ["bb1", "cc1"])
+
+
+class RetentionTests(TestCase):
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.old = self.now - datetime.timedelta(days=400)
+        self.user = User.objects.create_student(
+            "ret@example.com", "ret", None, first_name="R", last_name="Test", phone="0",
+        )
+        self.policies = {policy.model: policy for policy in retention.get_policies()}
+
+    def notify(self, created_at, is_read=True):
+        return Notification.objects.create(
+            user=self.user, type="info", title="t", message="m", is_read=is_read, created_at=created_at,
+        )
+
+    def log(self, created_at, record_id):
+        return AuditLog.objects.create(
+            table_name="books", record_id=record_id, action_type="UPDATE",
+            new_data={"title": f"Book {record_id}"}, created_at=created_at,
+        )
+
+    def test_chunk_boundaries(self):
+        # The pause follows every full chunk, so it counts them.
+        for chunk_size, full_chunks in ((1, 5), (2, 2), (5, 1), (6, 0)):
+            with self.subTest(chunk_size=chunk_size):
+                Notification.objects.all().delete()
+                expired = [self.notify(self.old) for _ in range(5)]
+                fresh = self.notify(self.now)
+                with mock.patch("Eduvix.retention.time.sleep") as sleep:
+                    removed = retention.purge(self.policies[Notification], chunk_size=chunk_size, now=self.now)
+                self.assertEqual(removed, len(expired))
+                self.assertEqual(sleep.call_count, full_chunks)
+                self.assertEqual(list(Notification.objects.values_list("pk", flat=True)), [fresh.pk])
+
+    def test_condition_is_respected(self):
+        unread = self.notify(self.old, is_read=False)
+        self.notify(self.old)
+        self.assertEqual(retention.purge(self.policies[Notification], pause=0, now=self.now), 1)
+        self.assertEqual(list(Notification.objects.values_list("pk", flat=True)), [unread.pk])
+
+    def test_archive_contents(self):
+        expired = [self.log(self.old, record_id) for record_id in range(3)]
+        kept = self.log(self.now, 99)
+        archive_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, archive_dir)
+        policy = self.policies[AuditLog]
+
+        removed = retention.purge(policy, chunk_size=2, pause=0, archive_dir=archive_dir, now=self.now)
+
+        self.assertEqual(removed, 3)
+        self.assertEqual(list(AuditLog.objects.values_list("pk", flat=True)), [kept.pk])
+        with gzip.open(policy.archive_path(archive_dir, self.now), "rt") as archive:
+            rows = [json.loads(line) for line in archive]
+        self.assertEqual([row["id"] for row in rows], [log.pk for log in expired])
+        self.assertEqual(rows[1]["new_data"], {"title": "Book 1"})
+        self.assertEqual(rows[1]["created_at"][:19], self.old.isoformat()[:19])
+
+    def test_archive_needs_a_directory(self):
+        self.log(self.old, 1)
+        with self.assertRaises(ValueError):
+            retention.purge(self.policies[AuditLog], pause=0, now=self.now)
+        self.assertEqual(AuditLog.objects.count(), 1)
+
+    def test_dry_run_only_counts(self):
+        self.notify(self.old)
+        self.log(self.old, 1)
+        out = StringIO()
+        call_command("purge_expired", "--dry-run", stdout=out)
+        self.assertIn("accounts.Notification: 1 rows would be purged", out.getvalue())
+        self.assertIn("accounts.AuditLog: 1 rows would be purged", out.getvalue())
+        self.assertEqual(Notification.objects.count(), 1)
+        self.assertEqual(AuditLog.objects.count(), 1)
+
+    def test_model_option_selects_policies(self):
+        self.notify(self.old)
+        self.log(self.old, 1)
+        out = StringIO()
+        call_command("purge_expired", "--model", "accounts.notification", "--pause", "0", stdout=out)
+        self.assertEqual(out.getvalue(), "accounts.Notification: purged 1 rows\n")
+        self.assertFalse(Notification.objects.exists())
+        self.assertEqual(AuditLog.objects.count(), 1)
+        with self.assertRaises(CommandError):
+            call_command("purge_expired", "--model", "accounts.nothing")
@@ -0,0 +1,328 @@
+"""
+Resized thumbnails for the image URLs stored on models (book covers, course
+photos, avatars).
+
+Apps register their image fields from ``ready()``::
+
+    thumbnails.register("course", Course, "photo")
+
+List serializers then emit ``thumbnail_url("course", row["id"], row["photo"])``
+instead of the full-size image. Those URLs are served by
+``Eduvix.views.ThumbnailView``. The first request for a thumbnail loads the
+source, shrinks it with Pillow and stores a JPEG under
+``THUMBNAIL_CACHE_DIR``; later requests are served from disk. Cache files are
+named after a hash of the source and size, so an image shared by many rows is
+resized once. The directory is capped at ``THUMBNAIL_CACHE_MAX_BYTES``. Hits
+refresh a file's mtime, and the least recently used files are evicted first.
+
+Sources are read from ``MEDIA_ROOT`` (relative paths or ``MEDIA_URL`` paths)
+or fetched from hosts listed in ``THUMBNAIL_REMOTE_HOSTS``. For anything else,
+or on installs without Pillow (it is optional), serializers emit the original
+URL instead.
+"""
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from importlib.util import find_spec
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.urls import reverse
+
+logger = logging.getLogger(__name__)
+
+SIZES = {
+    "small": (160, 160),
+    "medium": (480, 480),
+}
+
+JPEG_QUALITY = 80
+
+# Evicting down to this share of the cap leaves room for a burst of new
+# thumbnails before the directory has to be scanned again.
+LOW_WATERMARK = 0.9
+
+# Each process tracks the directory size from its own writes and rescans it at
+# least this often (seconds), which picks up what other workers wrote. Between
+# rescans N workers can overshoot the cap by at most their combined writes.
+RECOUNT_INTERVAL = 60
+
+# Hits only rewrite the mtime when it is older than this; the LRU order does
+# not need to be more precise than that.
+TOUCH_INTERVAL = 60 * 60
+
+# Sources that failed to load or decode are not retried for this long, so a
+# broken image or a slow remote host does not cost every request a timeout.
+FAILURE_TTL = 60 * 5
+
+_sources = {}
+
+
+# Checked without importing Pillow, which stays out of process startup.
+_pillow_installed = find_spec("PIL") is not None
+
+
+def available():
+    return _pillow_installed
+
+
+def register(kind, model, field):
+    _sources[kind] = (model, field)
+
+
+def registered_kinds():
+    return _sources.keys()
+
+
+def get_source(kind, pk):
+    """The stored image URL of object ``pk`` of a registered ``kind``."""
+    model, field = _sources[kind]
+    return model._default_manager.filter(pk=pk).values_list(field, flat=True).first()
+
+
+def source_digest(source):
+    return hashlib.md5(source.encode(), usedforsecurity=False).hexdigest()[:12]
+
+
+def original_url(source):
+    if urlsplit(source).scheme or source.startswith("/"):
+        return source
+    return "/" + settings.MEDIA_URL.strip("/") + "/" + source
+
+
+def thumbnail_url(kind, pk, source, size="small"):
+    """URL to use in place of ``source``; ``None`` when there is no image."""
+    if not source:
+        return None
+    if not _pillow_installed or _fetch(source) is None:
+        return original_url(source)
+    path = reverse("thumbnail", kwargs={"kind": kind, "pk": pk, "size": size})
+    # The digest changes with the source, so clients may cache the URL forever.
+    return f"{path}?v={source_digest(source)}"
+
+
+def add_thumbnail_urls(rows, kind, field, name, size="small"):
+    for row in rows:
+        row[name] = thumbnail_url(kind, row["id"], row[field], size)
+    return rows
+
+
+class ThumbnailCache:
+    """Files under ``directory`` capped at ``max_bytes``, evicted by mtime."""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = str(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._bytes = None
+        self._counted_at = 0.0
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.jpg")
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            mtime = os.stat(path).st_mtime
+        except FileNotFoundError:
+            return None
+        now = time.time()
+        if now - mtime > TOUCH_INTERVAL:
+            try:
+                os.utime(path, (now, now))
+            except FileNotFoundError:
+                # Evicted by another process since the stat.
+                return None
+        return path
+
+    def put(self, key, data):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so readers never see a partial file.
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+        with self._lock:
+            now = time.monotonic()
+            if self._bytes is None or now - self._counted_at >= RECOUNT_INTERVAL:
+                self._bytes = self.usage()[1]
+                self._counted_at = now
+            else:
+                self._bytes += len(data)
+            over = self._bytes > self.max_bytes
+        if over:
+            self.prune()
+        return path
+
+    def _files(self):
+        if not os.path.isdir(self.directory):
+            return []
+        files = []
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name.endswith(".jpg"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files
+
+    def usage(self):
+        files = self._files()
+        return len(files), sum(size for _, size, _ in files)
+
+    def prune(self, target=None):
+        """Delete least recently used files until the cache fits ``target`` bytes."""
+        if target is None:
+            target = int(self.max_bytes * LOW_WATERMARK)
+        with self._lock:
+            files = sorted(self._files())
+            total = sum(size for _, size, _ in files)
+            removed = 0
+            for _, size, path in files:
+                if total <= target:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+            self._bytes = total
+            self._counted_at = time.monotonic()
+        return removed
+
+    def clear(self):
+        return self.prune(target=0)
+
+
+_cache = None
+# Striped locks stop concurrent requests for a cold thumbnail from all
+# resizing the same image.
+_render_locks = [threading.Lock() for _ in range(64)]
+_failures = {}
+
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        _cache = ThumbnailCache(settings.THUMBNAIL_CACHE_DIR, settings.THUMBNAIL_CACHE_MAX_BYTES)
+    return _cache
+
+
+def _local_path(source):
+    url = urlsplit(source)
+    if url.scheme or url.netloc:
+        return None
+    path = url.path
+    media_url = "/" + settings.MEDIA_URL.strip("/") + "/"
+    if path.startswith(media_url):
+        path = path[len(media_url):]
+    elif path.startswith("/"):
+        return None
+    root = os.path.realpath(settings.MEDIA_ROOT)
+    full = os.path.realpath(os.path.join(root, path))
+    # Keep "../" in a stored value from reading outside MEDIA_ROOT.
+    if os.path.commonpath([root, full]) != root:
+        return None
+    return full
+
+
+def _fetch(source):
+    """Return ``(cache version, bytes loader)`` for ``source``, or ``None``."""
+    local = _local_path(source)
+    if local is not None:
+        try:
+            version = os.stat(local).st_mtime_ns
+        except OSError:
+            return None
+
+        def load():
+            with open(local, "rb") as f:
+                return f.read(settings.THUMBNAIL_MAX_SOURCE_BYTES + 1)
+        return version, load
+
+    url = urlsplit(source)
+    if url.scheme in ("http", "https") and url.hostname in settings.THUMBNAIL_REMOTE_HOSTS:
+        def load():
+            import urllib.request
+            with urllib.request.urlopen(source, timeout=5) as remote:
+                return remote.read(settings.THUMBNAIL_MAX_SOURCE_BYTES + 1)
+        return None, load
+    return None
+
+
+def render(data, size):
+    from PIL import Image, ImageOps
+
+    with Image.open(BytesIO(data)) as image:
+        # Lets the JPEG decoder scale down by 1/2..1/8 while decoding, which
+        # is most of the cost for large photos.
+        image.draft("RGB", (size[0] * 2, size[1] * 2))
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(size, Image.Resampling.LANCZOS)
+        if image.mode in ("RGBA", "LA", "P"):
+            image = image.convert("RGBA")
+            background = Image.new("RGB", image.size, "white")
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        elif image.mode != "RGB":
+            image = image.convert("RGB")
+        out = BytesIO()
+        image.save(out, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+    return out.getvalue()
+
+
+def get_thumbnail(source, size_name):
+    """
+    Path of the cached thumbnail of ``source``, rendering it on first use.
+    Returns ``None`` when the source cannot be thumbnailed.
+    """
+    if not _pillow_installed:
+        return None
+    fetched = _fetch(source)
+    if fetched is None:
+        return None
+    version, load = fetched
+    size = SIZES[size_name]
+    key = hashlib.sha256(f"{source}|{version}|{size[0]}x{size[1]}|{JPEG_QUALITY}".encode()).hexdigest()
+
+    cache = get_cache()
+    path = cache.get(key)
+    if path is not None:
+        return path
+
+    failed_at = _failures.get(key)
+    if failed_at is not None and time.monotonic() - failed_at < FAILURE_TTL:
+        return None
+
+    with _render_locks[hash(key) % len(_render_locks)]:
+        path = cache.get(key)
+        if path is not None:
+            return path
+        try:
+            data = load()
+            if len(data) > settings.THUMBNAIL_MAX_SOURCE_BYTES:
+                raise ValueError("source image too large")
+            thumbnail = render(data, size)
+        except Exception:
+            # Broken, huge or unreachable images fall back to the original.
+            logger.warning("Could not create a thumbnail of %s", source, exc_info=True)
+            _failures[key] = time.monotonic()
+            return None
+        _failures.pop(key, None)
+        return cache.put(key, thumbnail)
+
@@ -16,8 +16,14 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path,include
+from .views import ThumbnailView
+
+admin.autodiscover()
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/accounts/', include('accounts.urls')),
+    path('api/courses/', include('courses.urls')),
+    path('api/library/', include('library.urls')),
+    path('api/thumbnails/<str:kind>/<int:pk>/<str:size>/', ThumbnailView.as_view(), name='thumbnail'),
 ]
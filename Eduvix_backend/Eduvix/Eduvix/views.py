@@ -0,0 +1,51 @@
+"""
+Project-level views that serve more than one app.
+"""
+from django.http import FileResponse, HttpResponseNotModified, HttpResponseRedirect
+from django.utils.cache import patch_cache_control
+from django.utils.http import url_has_allowed_host_and_scheme
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from Eduvix import thumbnails
+
+
+class ThumbnailView(APIView):
+    """
+    Serves the cached thumbnail of a book cover, course photo or avatar,
+    rendering it on first request. Falls back to redirecting to the original
+    image when it cannot be thumbnailed (or Pillow is not installed), but
+    only when that image is on this site.
+    """
+    authentication_classes = []
+
+    def get(self, request, kind, pk, size):
+        if kind not in thumbnails.registered_kinds() or size not in thumbnails.SIZES:
+            return Response({"detail": "Unknown thumbnail"}, status=status.HTTP_404_NOT_FOUND)
+        source = thumbnails.get_source(kind, pk)
+        if not source:
+            return Response({"detail": "Image not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        digest = thumbnails.source_digest(source)
+        etag = f'"{digest}-{size}"'
+        if request.META.get("HTTP_IF_NONE_MATCH") == etag:
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+            return response
+
+        path = thumbnails.get_thumbnail(source, size)
+        if path is None:
+            original = thumbnails.original_url(source)
+            # Image URLs are user-supplied: never redirect off-site.
+            if not url_has_allowed_host_and_scheme(original, allowed_hosts={request.get_host()}):
+                return Response({"detail": "Image not found"}, status=status.HTTP_404_NOT_FOUND)
+            return HttpResponseRedirect(original)
+
+        response = FileResponse(open(path, "rb"), content_type="image/jpeg")
+        response["ETag"] = etag
+        if request.query_params.get("v") == digest:
+            # Thumbnail URLs carry the source digest, so this one never changes.
+            patch_cache_control(response, public=True, max_age=60 * 60 * 24 * 365, immutable=True)
+        else:
+            patch_cache_control(response, public=True, max_age=60 * 5)
+        return response
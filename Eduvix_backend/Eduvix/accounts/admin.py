@@ -1,6 +1,10 @@
 from django.contrib import admin
-from .models import User, Teacher, Student
+from Eduvix.admin import SoftDeleteAdmin
+from .models import User, Teacher, Student, PasswordReset, Notification, AuditLog
 
-admin.site.register(User)
+admin.site.register(User, SoftDeleteAdmin)
 admin.site.register(Teacher)
-admin.site.register(Student)
\ No newline at end of file
+admin.site.register(Student)
+admin.site.register(PasswordReset)
+admin.site.register(Notification)
+admin.site.register(AuditLog)
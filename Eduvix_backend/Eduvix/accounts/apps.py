@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class AccountsConfig(AppConfig):
     name = 'accounts'
+
+    def ready(self):
+        from Eduvix import thumbnails
+        from . import signals  # noqa: F401
+        from .models import User
+        thumbnails.register("avatar", User, "avatar")
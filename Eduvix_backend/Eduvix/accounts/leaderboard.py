@@ -0,0 +1,539 @@
+"""
+In-memory student leaderboards.
+
+Students are kept ordered by ``(-points, user_id)`` in an indexable skip list,
+so point updates, rank lookups and top-K slices all run in O(log n) instead of
+an ``ORDER BY points`` + ``COUNT(*)`` per request.
+
+Boards live in each process. Changes committed through the ORM (see
+``accounts.signals``) are applied to the local boards as ``(user_id, points)``
+updates and appended to a change log in the default cache. Other processes
+replay the log on their next read (see ``LeaderboardRegistry``).
+"""
+import logging
+import random
+import threading
+import time
+from collections import OrderedDict
+from math import log
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+MAX_LEVELS = 32
+
+SEQ_KEY = "leaderboard:seq"
+CHANGE_KEY = "leaderboard:change:%d"
+
+# Change log entry asking every process to reload its boards from the database.
+RELOAD = "reload"
+
+# Reads look for new change log entries at most this often (seconds).
+SYNC_INTERVAL = 1
+
+# How long entries stay in the log. A process that falls further behind, or
+# more than MAX_REPLAY entries behind, reloads instead of replaying.
+CHANGE_LOG_TTL = 60 * 60
+MAX_REPLAY = 10_000
+
+# The sequence number is taken before its entry is written, so a missing entry
+# is only treated as lost (forcing a reload) once it has been missing this long.
+GAP_GRACE = 5
+
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, levels):
+        self.key = key
+        self.next = [None] * levels
+        self.width = [1] * levels
+
+
+class IndexableSkipList:
+    """Sorted container with O(log n) insert, remove, rank and index access."""
+
+    def __init__(self, keys=()):
+        self._head = _Node(None, MAX_LEVELS)
+        self._levels = 1
+        self._size = 0
+        keys = sorted(keys)
+        if keys:
+            self._bulk_load(keys)
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        node = self._head.next[0]
+        while node is not None:
+            yield node.key
+            node = node.next[0]
+
+    @staticmethod
+    def _random_level():
+        return min(MAX_LEVELS, 1 - int(log(1.0 - random.random(), 2.0)))
+
+    def _bulk_load(self, keys):
+        # Link an already sorted sequence in a single O(n) pass.
+        head = self._head
+        last = [head] * MAX_LEVELS
+        last_pos = [0] * MAX_LEVELS
+        levels = 1
+        for pos, key in enumerate(keys, 1):
+            depth = self._random_level()
+            node = _Node(key, depth)
+            for lvl in range(depth):
+                prev = last[lvl]
+                prev.next[lvl] = node
+                prev.width[lvl] = pos - last_pos[lvl]
+                last[lvl] = node
+                last_pos[lvl] = pos
+            levels = max(levels, depth)
+        size = len(keys)
+        for lvl in range(levels):
+            last[lvl].width[lvl] = size + 1 - last_pos[lvl]
+        self._levels = levels
+        self._size = size
+
+    def _find(self, key):
+        # Returns the rightmost node before ``key`` on every level and the
+        # position of each of those nodes (head is position 0).
+        chain = [None] * self._levels
+        positions = [0] * self._levels
+        node = self._head
+        pos = 0
+        for lvl in reversed(range(self._levels)):
+            nxt = node.next[lvl]
+            while nxt is not None and nxt.key < key:
+                pos += node.width[lvl]
+                node = nxt
+                nxt = node.next[lvl]
+            chain[lvl] = node
+            positions[lvl] = pos
+        return chain, positions
+
+    def add(self, key):
+        depth = self._random_level()
+        head = self._head
+        if depth > self._levels:
+            for lvl in range(self._levels, depth):
+                head.next[lvl] = None
+                head.width[lvl] = self._size + 1
+            self._levels = depth
+        chain, positions = self._find(key)
+        new_pos = positions[0] + 1
+        node = _Node(key, depth)
+        for lvl in range(depth):
+            prev = chain[lvl]
+            prev_pos = positions[lvl]
+            node.next[lvl] = prev.next[lvl]
+            node.width[lvl] = prev_pos + prev.width[lvl] + 1 - new_pos
+            prev.next[lvl] = node
+            prev.width[lvl] = new_pos - prev_pos
+        for lvl in range(depth, self._levels):
+            chain[lvl].width[lvl] += 1
+        self._size += 1
+
+    def remove(self, key):
+        chain, _ = self._find(key)
+        target = chain[0].next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+        for lvl in range(self._levels):
+            prev = chain[lvl]
+            if prev.next[lvl] is target:
+                prev.width[lvl] += target.width[lvl] - 1
+                prev.next[lvl] = target.next[lvl]
+            else:
+                prev.width[lvl] -= 1
+        self._size -= 1
+
+    def index(self, key):
+        """Zero-based position of ``key``; raises ``KeyError`` if absent."""
+        chain, positions = self._find(key)
+        target = chain[0].next[0]
+        if target is None or target.key != key:
+            raise KeyError(key)
+        return positions[0]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError("skip list index out of range")
+        node = self._head
+        pos = 0
+        target = index + 1
+        for lvl in reversed(range(self._levels)):
+            while node.next[lvl] is not None and pos + node.width[lvl] <= target:
+                pos += node.width[lvl]
+                node = node.next[lvl]
+        return node.key
+
+    def islice(self, start, count):
+        if count <= 0 or start >= self._size:
+            return []
+        node = self._head
+        pos = 0
+        target = start + 1
+        for lvl in reversed(range(self._levels)):
+            while node.next[lvl] is not None and pos + node.width[lvl] <= target:
+                pos += node.width[lvl]
+                node = node.next[lvl]
+        keys = []
+        while node is not None and len(keys) < count:
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+
+def current_seq():
+    seq = cache.get(SEQ_KEY)
+    if seq is None:
+        # Seeded with a timestamp so an evicted counter never comes back at a
+        # value some board was built under.
+        cache.add(SEQ_KEY, time.time_ns(), timeout=None)
+        seq = cache.get(SEQ_KEY)
+    return seq
+
+
+def append_changes(changes):
+    try:
+        seq = cache.incr(SEQ_KEY)
+    except ValueError:
+        # The counter was evicted. Restarting it from a timestamp puts every
+        # process too far behind to replay, so they all reload.
+        cache.set(SEQ_KEY, time.time_ns(), timeout=None)
+        return None
+    cache.set(CHANGE_KEY % seq, changes, timeout=CHANGE_LOG_TTL)
+    return seq
+
+
+class Leaderboard:
+    """Points ranking for one scope (all students, or one course)."""
+
+    def __init__(self, rows=(), seq=None):
+        self._lock = threading.Lock()
+        self.load(rows, seq)
+
+    def load(self, rows, seq=None):
+        scores = dict(rows)
+        ranking = IndexableSkipList((-points, user_id) for user_id, points in scores.items())
+        with self._lock:
+            self._scores = scores
+            self._ranking = ranking
+            # Last change log entry reflected in the board.
+            self.seq = seq
+            self.built_at = time.monotonic()
+
+    def apply(self, scope, changes):
+        """
+        Apply ``(user_id, points, scopes)`` changes. ``points`` of ``None``
+        removes the user. Otherwise the user is updated where already ranked,
+        and added to the global board and to any board listed in ``scopes``.
+        """
+        for user_id, points, scopes in changes:
+            if points is None:
+                self.discard(user_id)
+            elif scope is None or user_id in self or (scopes and scope in scopes):
+                self.update(user_id, points)
+
+    def __len__(self):
+        return len(self._scores)
+
+    def __contains__(self, user_id):
+        return user_id in self._scores
+
+    def update(self, user_id, points):
+        # Raises before anything is touched if ``points`` is not a number
+        # (e.g. an unresolved F() expression).
+        points = int(points)
+        with self._lock:
+            old = self._scores.get(user_id)
+            if old == points:
+                return
+            if old is not None:
+                self._ranking.remove((-old, user_id))
+            try:
+                self._ranking.add((-points, user_id))
+            except BaseException:
+                if old is not None:
+                    self._ranking.add((-old, user_id))
+                raise
+            self._scores[user_id] = points
+
+    def discard(self, user_id):
+        with self._lock:
+            old = self._scores.pop(user_id, None)
+            if old is not None:
+                self._ranking.remove((-old, user_id))
+
+    def points(self, user_id):
+        return self._scores.get(user_id)
+
+    def rank(self, user_id):
+        """One-based rank of ``user_id``, or ``None`` if not on the board."""
+        with self._lock:
+            points = self._scores.get(user_id)
+            if points is None:
+                return None
+            return self._ranking.index((-points, user_id)) + 1
+
+    def top(self, limit, offset=0):
+        """``(rank, user_id, points)`` rows for ranks ``offset+1 .. offset+limit``."""
+        with self._lock:
+            keys = self._ranking.islice(offset, limit)
+        return [
+            (offset + i + 1, user_id, -neg_points)
+            for i, (neg_points, user_id) in enumerate(keys)
+        ]
+
+
+def _load_global():
+    from .models import Student
+    return (
+        Student.objects.filter(user__deleted_at__isnull=True)
+        .values_list("user_id", "points")
+        .iterator(chunk_size=10000)
+    )
+
+
+class LeaderboardRegistry:
+    """
+    Boards keyed by scope.
+
+    ``None`` is the global board. Other apps register a loader for their own
+    scope kind, e.g. ``register_loader("course", load_course_rows)``, and ask
+    for ``get(("course", course_id))``; the loader receives the scope id and
+    returns ``(user_id, points)`` rows, or raises ``LookupError`` for an id
+    that has no board (an unknown course, say). ``memberships`` returns the
+    scope ids a user belongs to, used to put restored users back. At most
+    ``LEADERBOARD_MAX_BOARDS`` scoped boards are kept, least recently read
+    first out; the global board is never evicted.
+
+    Web workers build the global board in a background thread at startup
+    (``warm_up()``, called from ``wsgi.py``/``asgi.py``). Requests that arrive
+    before it is ready wait for that build. Course boards are built on their
+    first read.
+
+    Once built, a board follows the change log: reads replay new entries at
+    most once per ``SYNC_INTERVAL`` seconds, at O(log n) per change. A board is
+    reloaded from the database, in a background thread while readers keep the
+    old one, when:
+    - it is ``LEADERBOARD_MAX_AGE`` seconds old, which picks up writes that
+      bypass the signals, such as ``QuerySet.update()``;
+    - ``invalidate()`` is called after such writes;
+    - the process fell too far behind the log.
+
+    The log lives in the default cache. Point that at a shared backend
+    (Redis, Memcached) so every worker sees it. With a per-process cache, only
+    the age limit catches changes made by other workers.
+    """
+
+    def __init__(self, background=True):
+        self._boards = OrderedDict()
+        self._loaders = {None: _load_global}
+        self._memberships = {}
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._build_locks = {}
+        self._rebuilding = set()
+        self._synced_at = 0.0
+        self._gap = None
+        # Tests run reloads inline.
+        self._background = background
+
+    def register_loader(self, kind, loader, memberships=None):
+        self._loaders[kind] = loader
+        if memberships is not None:
+            self._memberships[kind] = memberships
+
+    def scopes_of(self, user_id):
+        scopes = [None]
+        for kind, memberships in self._memberships.items():
+            scopes.extend((kind, scope_id) for scope_id in memberships(user_id))
+        return scopes
+
+    def _load_rows(self, scope):
+        if scope is None:
+            return self._loaders[None]()
+        kind, scope_id = scope
+        try:
+            loader = self._loaders[kind]
+        except KeyError:
+            raise LookupError(f"No leaderboard loader registered for {kind!r}")
+        return loader(scope_id)
+
+    def get(self, scope=None):
+        board = self._boards.get(scope)
+        if board is None:
+            return self._build(scope)
+        if scope is not None:
+            with self._lock:
+                if scope in self._boards:
+                    self._boards.move_to_end(scope)
+        self._sync()
+        return board
+
+    def _build(self, scope):
+        # Per-scope lock: building one course's board does not hold up reads
+        # of boards that are already loaded.
+        with self._lock:
+            build_lock = self._build_locks.setdefault(scope, threading.Lock())
+        try:
+            with build_lock:
+                board = self._boards.get(scope)
+                if board is None:
+                    # Taken before the rows, so changes committed while
+                    # loading are replayed rather than lost.
+                    seq = current_seq()
+                    board = Leaderboard(self._load_rows(scope), seq)
+                    with self._lock:
+                        self._boards[scope] = board
+                        self._evict()
+        finally:
+            with self._lock:
+                self._build_locks.pop(scope, None)
+        return board
+
+    def _evict(self):
+        limit = getattr(settings, "LEADERBOARD_MAX_BOARDS", 100)
+        scoped = [scope for scope in self._boards if scope is not None]
+        for scope in scoped[:max(len(scoped) - limit, 0)]:
+            del self._boards[scope]
+
+    def _run(self, target, *args):
+        if not self._background:
+            target(*args)
+            return
+        def run():
+            try:
+                target(*args)
+            finally:
+                connections.close_all()
+        threading.Thread(target=run, name="leaderboard-reload", daemon=True).start()
+
+    def _reload(self, scope, board):
+        with self._lock:
+            if scope in self._rebuilding:
+                return
+            self._rebuilding.add(scope)
+        self._run(self._do_reload, scope, board)
+
+    def _do_reload(self, scope, board):
+        try:
+            seq = current_seq()
+            board.load(self._load_rows(scope), seq)
+        except LookupError:
+            # The scope is gone (e.g. the course was unpublished).
+            with self._lock:
+                self._boards.pop(scope, None)
+        except Exception:
+            logger.exception("Reloading leaderboard %r failed", scope)
+        finally:
+            with self._lock:
+                self._rebuilding.discard(scope)
+
+    def _sync(self):
+        now = time.monotonic()
+        if now - self._synced_at < SYNC_INTERVAL or not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            self._synced_at = now
+            self._replay(now)
+        finally:
+            self._sync_lock.release()
+
+    def _replay(self, now):
+        boards = self.loaded()
+        max_age = getattr(settings, "LEADERBOARD_MAX_AGE", 600)
+        for scope, board in boards:
+            if now - board.built_at >= max_age:
+                self._reload(scope, board)
+
+        head = current_seq()
+        behind = [(scope, board) for scope, board in boards if board.seq is None or board.seq < head]
+        if not behind:
+            return
+        too_far = [(scope, board) for scope, board in behind
+                   if board.seq is None or head - board.seq > MAX_REPLAY]
+        for scope, board in too_far:
+            self._reload(scope, board)
+        behind = [item for item in behind if item not in too_far]
+        if not behind:
+            return
+
+        start = min(board.seq for _, board in behind) + 1
+        entries = cache.get_many([CHANGE_KEY % seq for seq in range(start, head + 1)])
+        log = []
+        for seq in range(start, head + 1):
+            changes = entries.get(CHANGE_KEY % seq)
+            if changes is None:
+                if self._gap is None or self._gap[0] != seq:
+                    self._gap = (seq, now)
+                elif now - self._gap[1] > GAP_GRACE:
+                    # Expired or never written: the change cannot be replayed.
+                    self._gap = None
+                    for scope, board in behind:
+                        self._reload(scope, board)
+                    return
+                break
+            log.append((seq, changes))
+        else:
+            self._gap = None
+
+        for scope, board in behind:
+            for seq, changes in log:
+                if seq <= board.seq:
+                    continue
+                if changes == RELOAD:
+                    self._reload(scope, board)
+                    break
+                board.apply(scope, changes)
+                board.seq = seq
+
+    def loaded(self):
+        return list(self._boards.items())
+
+    def publish(self, changes):
+        """
+        Apply committed ``(user_id, points, scopes)`` changes (see
+        ``Leaderboard.apply``) to this process's boards, and log them for the
+        other processes. Replaying its own entry later is harmless.
+        """
+        for scope, board in self.loaded():
+            board.apply(scope, changes)
+        append_changes(changes)
+
+    def invalidate(self):
+        """Make every process reload its boards, e.g. after ``QuerySet.update()``."""
+        append_changes(RELOAD)
+
+    def warm_up(self):
+        """Build the global board in the background, ahead of the first request."""
+        self._run(self._warm)
+
+    def _warm(self):
+        try:
+            self.get()
+        except Exception:
+            logger.exception("Building the global leaderboard failed")
+
+    def rebuild(self, scope=None):
+        board = self._boards.get(scope)
+        if board is None:
+            return self.get(scope)
+        seq = current_seq()
+        board.load(self._load_rows(scope), seq)
+        return board
+
+    def clear(self):
+        with self._lock:
+            self._boards.clear()
+
+
+leaderboards = LeaderboardRegistry()
@@ -0,0 +1,61 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.leaderboard import Leaderboard
+
+
+class Command(BaseCommand):
+    help = "Benchmark the in-memory leaderboard on synthetic student data."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=1_000_000)
+        parser.add_argument("--ops", type=int, default=100_000)
+        parser.add_argument("--max-points", type=int, default=50_000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def _report(self, label, seconds, ops):
+        per_op = seconds / ops * 1e6 if ops else 0.0
+        self.stdout.write(f"{label:<12} {seconds:8.3f}s  {ops:>9} ops  {per_op:8.2f} us/op")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        random.seed(options["seed"])
+        students = options["students"]
+        ops = options["ops"]
+        max_points = options["max_points"]
+
+        rows = [(user_id, rng.randint(0, max_points)) for user_id in range(1, students + 1)]
+
+        start = time.perf_counter()
+        board = Leaderboard(rows)
+        self._report("build", time.perf_counter() - start, students)
+
+        user_ids = [rng.randint(1, students) for _ in range(ops)]
+
+        start = time.perf_counter()
+        for user_id in user_ids:
+            board.update(user_id, board.points(user_id) + rng.randint(1, 100))
+        self._report("update", time.perf_counter() - start, ops)
+
+        start = time.perf_counter()
+        for user_id in user_ids:
+            board.rank(user_id)
+        self._report("rank", time.perf_counter() - start, ops)
+
+        offsets = [rng.randint(0, students - 1) for _ in range(ops)]
+        start = time.perf_counter()
+        for offset in offsets:
+            board.top(10, offset)
+        self._report("top-10", time.perf_counter() - start, ops)
+
+        # Baseline: what the COUNT(*)-per-request approach costs without an
+        # index, i.e. a linear scan over every student's points.
+        scores = [points for _, points in rows]
+        sample = user_ids[: max(1, ops // 1000)]
+        start = time.perf_counter()
+        for user_id in sample:
+            mine = board.points(user_id)
+            sum(1 for points in scores if points > mine)
+        self._report("scan-rank", time.perf_counter() - start, len(sample))
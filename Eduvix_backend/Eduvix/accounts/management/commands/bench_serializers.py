@@ -0,0 +1,106 @@
+import io
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from rest_framework import serializers
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from Eduvix.parsers import FastJSONParser
+from Eduvix.renderers import FastJSONRenderer
+from Eduvix.serializers import ValuesSerializer
+from accounts.models import User
+
+FIELDS = ("id", "username", "first_name", "last_name", "role", "is_verified", "created_at")
+
+
+class UserModelSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = FIELDS
+
+
+class UserValuesSerializer(ValuesSerializer):
+    fields = FIELDS
+
+
+class Command(BaseCommand):
+    help = "Compare ModelSerializer + JSONRenderer with the lean values/orjson path."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def _time(self, func, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def _report(self, rows, label, seconds):
+        self.stdout.write(f"{rows:>7} rows  {label:<36} {seconds * 1000:9.2f} ms")
+
+    def handle(self, *args, **options):
+        repeat = options["repeat"]
+        # Only rows tagged for this run are read and deleted; existing users
+        # are never touched.
+        tag = uuid.uuid4().hex[:8]
+        prefix = f"bench-{tag}-"
+        queryset = User.all_objects.filter(username__startswith=prefix).order_by("id")
+        try:
+            created = 0
+            for size in options["sizes"]:
+                User.all_objects.bulk_create(
+                    User(
+                        email=f"{prefix}{i}@example.com",
+                        username=f"{prefix}{i}",
+                        first_name="Bench",
+                        last_name=f"User {i}",
+                        phone="0000000000",
+                    )
+                    for i in range(created, size)
+                )
+                created = max(created, size)
+                self._bench(size, queryset[:size], repeat)
+        finally:
+            User.all_objects.filter(username__startswith=prefix).delete()
+
+    def _bench(self, size, queryset, repeat):
+        stdlib_renderer = JSONRenderer()
+        fast_renderer = FastJSONRenderer()
+
+        seconds, model_data = self._time(
+            lambda: UserModelSerializer(queryset.all(), many=True).data, repeat)
+        self._report(size, "ModelSerializer", seconds)
+
+        seconds, values_data = self._time(
+            lambda: UserValuesSerializer(queryset.all()).data, repeat)
+        self._report(size, "ValuesSerializer", seconds)
+
+        seconds, payload = self._time(lambda: stdlib_renderer.render(model_data), repeat)
+        self._report(size, "JSONRenderer (ModelSerializer)", seconds)
+
+        seconds, _ = self._time(lambda: fast_renderer.render(model_data), repeat)
+        self._report(size, "FastJSONRenderer (ModelSerializer)", seconds)
+
+        seconds, _ = self._time(lambda: fast_renderer.render(values_data), repeat)
+        self._report(size, "FastJSONRenderer (ValuesSerializer)", seconds)
+
+        seconds, _ = self._time(
+            lambda: stdlib_renderer.render(UserModelSerializer(queryset.all(), many=True).data),
+            repeat)
+        self._report(size, "end to end: DRF default", seconds)
+
+        seconds, _ = self._time(
+            lambda: fast_renderer.render(UserValuesSerializer(queryset.all()).data), repeat)
+        self._report(size, "end to end: values + orjson", seconds)
+
+        seconds, _ = self._time(lambda: JSONParser().parse(io.BytesIO(payload)), repeat)
+        self._report(size, "JSONParser", seconds)
+
+        seconds, _ = self._time(lambda: FastJSONParser().parse(io.BytesIO(payload)), repeat)
+        self._report(size, "FastJSONParser", seconds)
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from Eduvix.http_cache import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = "Show hit/miss/304 counters of the shared HTTP response cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reset", action="store_true", help="Zero the counters after printing.")
+
+    def handle(self, *args, **options):
+        stats = get_stats()
+        self.stdout.write(f"hits:          {stats['hit']}")
+        self.stdout.write(f"misses:        {stats['miss']}")
+        self.stdout.write(f"not modified:  {stats['not_modified']}")
+        self.stdout.write(f"hit ratio:     {stats['hit_ratio']:.1%}")
+        if options["reset"]:
+            reset_stats()
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from Eduvix import retention
+
+
+class Command(BaseCommand):
+    help = "Delete or archive rows that have outlived their retention policy."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--pause", type=float, default=0.1, help="Seconds to sleep between chunks.")
+        parser.add_argument("--archive-dir", default=settings.RETENTION_ARCHIVE_DIR)
+        parser.add_argument("--model", action="append", dest="models", metavar="APP_LABEL.MODEL",
+                            help="Only run the policy for this model (repeatable).")
+        parser.add_argument("--dry-run", action="store_true")
+
+    def handle(self, *args, **options):
+        policies = retention.get_policies()
+        if options["models"]:
+            wanted = {label.lower() for label in options["models"]}
+            policies = [policy for policy in policies if policy.model._meta.label_lower in wanted]
+            if not policies:
+                raise CommandError("No retention policy for %s" % ", ".join(options["models"]))
+
+        now = timezone.now()
+        for policy in policies:
+            if options["dry_run"]:
+                count = policy.expired(now).count()
+                self.stdout.write(f"{policy.label}: {count} rows would be purged")
+                continue
+            removed = retention.purge(
+                policy,
+                chunk_size=options["chunk_size"],
+                pause=options["pause"],
+                archive_dir=options["archive_dir"],
+                now=now,
+            )
+            action = "archived and purged" if policy.archive else "purged"
+            self.stdout.write(f"{policy.label}: {action} {removed} rows")
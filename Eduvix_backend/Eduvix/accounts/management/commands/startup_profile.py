@@ -0,0 +1,86 @@
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+TARGETS = {
+    # What a management command pays before handle() runs.
+    "setup": "import django; django.setup()",
+    # What a gunicorn worker pays before serving its first request.
+    "wsgi": "import Eduvix.wsgi",
+    # wsgi plus resolving the URLconf, i.e. the cost of the first request.
+    "urls": "import Eduvix.wsgi; from django.urls import get_resolver; get_resolver().url_patterns",
+}
+
+CHILD = """
+import time
+_start = time.perf_counter()
+{code}
+print("startup_profile_wall", time.perf_counter() - _start)
+"""
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(stderr):
+    modules = []
+    for line in stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return modules
+
+
+class Command(BaseCommand):
+    help = "Report per-module import cost of process startup (python -X importtime)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--target", choices=sorted(TARGETS), default="wsgi")
+        parser.add_argument("--runs", type=int, default=5, help="Runs used for the wall-clock median.")
+        parser.add_argument("--top", type=int, default=20)
+        parser.add_argument("--sort", choices=("self", "cumulative"), default="cumulative")
+
+    def _run(self, code):
+        env = dict(os.environ, PYTHONDONTWRITEBYTECODE="")
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", CHILD.format(code=code)],
+            capture_output=True, text=True, env=env, cwd=os.getcwd(),
+        )
+        if result.returncode != 0:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+        wall = float(result.stdout.split("startup_profile_wall")[-1])
+        return wall, parse_importtime(result.stderr)
+
+    def handle(self, *args, **options):
+        code = TARGETS[options["target"]]
+        runs = [self._run(code) for _ in range(max(options["runs"], 1))]
+        walls = [wall for wall, _ in runs]
+        # Break down the fastest run; the slower ones mostly measure noise.
+        _, modules = min(runs, key=lambda run: run[0])
+
+        by_package = defaultdict(int)
+        for name, self_us, _, _ in modules:
+            by_package[name.split(".")[0]] += self_us
+        total_us = sum(by_package.values())
+
+        self.stdout.write(f"target: {options['target']} ({code})")
+        self.stdout.write(
+            f"wall time: median {statistics.median(walls) * 1000:.1f} ms, "
+            f"min {min(walls) * 1000:.1f} ms over {len(walls)} runs"
+        )
+        self.stdout.write(f"modules imported: {len(modules)}, import time: {total_us / 1000:.1f} ms")
+
+        self.stdout.write("\nimport time by top-level package (self):")
+        for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:options["top"]]:
+            self.stdout.write(f"  {self_us / 1000:8.1f} ms  {package}")
+
+        column = 1 if options["sort"] == "self" else 2
+        self.stdout.write(f"\nslowest modules by {options['sort']} time:")
+        for module in sorted(modules, key=lambda module: -module[column])[:options["top"]]:
+            name, self_us, cumulative_us, _ = module
+            self.stdout.write(f"  {self_us / 1000:8.1f} ms self  {cumulative_us / 1000:8.1f} ms cumulative  {name}")
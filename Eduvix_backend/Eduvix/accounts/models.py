@@ -1,8 +1,19 @@
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin, BaseUserManager
 from django.db import models
 from django.utils import timezone
+from Eduvix.soft_delete import ALIVE, SoftDeleteMixin, SoftDeleteQuerySet
+
+
+class UserQuerySet(SoftDeleteQuerySet):
+    def active(self):
+        # Matches the idx_users_active_not_deleted partial index predicate.
+        return self.filter(ALIVE, is_active=True)
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
+    def get_queryset(self):
+        return super().get_queryset().alive()
 
-class UserManager(BaseUserManager):
     def create_user(self, email, username, password=None, **extra_fields):
         if not email:
             raise ValueError("Users must have an email")
@@ -36,7 +47,7 @@ class UserManager(BaseUserManager):
         return self.create_user(email, username, password, **extra_fields)
 
 
-class User(AbstractBaseUser, PermissionsMixin):
+class User(SoftDeleteMixin, AbstractBaseUser, PermissionsMixin):
     ROLE_CHOICES = (
         ("student", "Student"),
         ("teacher", "Teacher"),
@@ -63,6 +74,16 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD ="username"
 
     objects = UserManager()
+    all_objects = UserQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["id"],
+                name="idx_users_active_not_deleted",
+                condition=ALIVE & models.Q(is_active=True),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.username} ({self.role})"
@@ -84,4 +105,58 @@ class Student(models.Model):
     level = models.CharField(max_length=50, blank=True, null=True)
 
     def __str__(self):
-        return f"Student: {self.user.username}"
\ No newline at end of file
+        return f"Student: {self.user.username}"
+
+class PasswordReset(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="password_resets")
+    token_hash = models.TextField()
+    expires_at = models.DateTimeField()
+    used = models.BooleanField(default=False)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"Password reset for {self.user.username}"
+
+
+class Notification(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="notifications")
+    type = models.CharField(max_length=50)
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    metadata = models.JSONField(blank=True, null=True)
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField(default=timezone.now)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "is_read"], name="idx_notifications_user_read"),
+            models.Index(fields=["user"], name="idx_notifications_unread", condition=models.Q(is_read=False)),
+        ]
+
+    def __str__(self):
+        return f"{self.title} -> {self.user.username}"
+
+
+class AuditLog(models.Model):
+    ACTION_CHOICES = (
+        ("INSERT", "Insert"),
+        ("UPDATE", "Update"),
+        ("DELETE", "Delete"),
+    )
+
+    table_name = models.TextField()
+    record_id = models.BigIntegerField()
+    action_type = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    old_data = models.JSONField(blank=True, null=True)
+    new_data = models.JSONField(blank=True, null=True)
+    changed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="+")
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["table_name", "record_id"], name="idx_audit_table_record"),
+        ]
+
+    def __str__(self):
+        return f"{self.action_type} {self.table_name}#{self.record_id}"
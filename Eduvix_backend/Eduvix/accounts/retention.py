@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.db.models import Q
+
+from Eduvix import retention
+from .models import AuditLog, Notification, PasswordReset, User
+
+retention.register(PasswordReset, age_field="expires_at", max_age=timedelta(days=1))
+
+retention.register(
+    Notification,
+    age_field="created_at",
+    max_age=timedelta(days=90),
+    condition=Q(is_read=True),
+)
+
+retention.register(AuditLog, age_field="created_at", max_age=timedelta(days=365), archive=True)
+
+retention.register(User, age_field="deleted_at", max_age=timedelta(days=30))
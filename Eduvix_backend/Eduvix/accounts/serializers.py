@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
 from django.contrib.auth import authenticate
 from .models import User
 from .utils import generate_otp,verify_otp,send_otp_email
@@ -22,6 +23,14 @@ class StudentRegistrationSerializer(serializers.ModelSerializer):
     class Meta:
         model=User
         fields = ['email', 'username', 'first_name', 'last_name', 'phone', 'password']
+        # User.objects hides soft-deleted users, whose rows still hold the
+        # unique email/username, so check against every row.
+        extra_kwargs = {
+            'email': {'validators': [UniqueValidator(
+                queryset=User.all_objects.all(), message="user with this email already exists.")]},
+            'username': {'validators': [UniqueValidator(
+                queryset=User.all_objects.all(), message="user with this username already exists.")]},
+        }
         
     def create(self, validated_data):
         user = User.objects.create_student(
@@ -39,7 +48,7 @@ class SendOTPSerializer(serializers.Serializer):
     
     def validate_email(self,value):
         try:
-            user = User.objects.get(email=value)
+            user = User.objects.active().get(email=value)
         except User.DoesNotExist:
             raise serializers.ValidationError("No user found with this email.")
 
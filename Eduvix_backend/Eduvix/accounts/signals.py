@@ -0,0 +1,39 @@
+from django.db import transaction
+from django.db.models.expressions import Combinable
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .leaderboard import leaderboards
+from .models import Student, User
+
+
+def _restore(user_id):
+    points = Student.objects.filter(pk=user_id).values_list("points", flat=True).first()
+    if points is not None:
+        leaderboards.publish([(user_id, points, leaderboards.scopes_of(user_id))])
+
+
+@receiver(post_save, sender=Student)
+def update_leaderboards(sender, instance, **kwargs):
+    if isinstance(instance.points, Combinable):
+        # Saved with F("points") + n: only the database knows the new value.
+        instance.refresh_from_db(fields=["points"])
+    # Boards (here and in other processes) must only see committed points.
+    change = (instance.pk, instance.points, None)
+    transaction.on_commit(lambda: leaderboards.publish([change]))
+
+
+@receiver(post_delete, sender=Student)
+def remove_from_leaderboards(sender, instance, **kwargs):
+    change = (instance.pk, None, None)
+    transaction.on_commit(lambda: leaderboards.publish([change]))
+
+
+@receiver(post_save, sender=User)
+def sync_leaderboards_with_deleted_at(sender, instance, update_fields=None, **kwargs):
+    user_id = instance.pk
+    if instance.deleted_at is not None:
+        transaction.on_commit(lambda: leaderboards.publish([(user_id, None, None)]))
+    elif update_fields and "deleted_at" in update_fields:
+        # Restored: back on the global board and the boards of their courses.
+        transaction.on_commit(lambda: _restore(user_id))
@@ -0,0 +1,213 @@
+import random
+from unittest import mock
+
+from django.core.cache import cache
+from django.db.models import F
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import override_settings
+
+from .leaderboard import CHANGE_KEY, IndexableSkipList, Leaderboard, LeaderboardRegistry, current_seq, leaderboards
+from .models import Student, User
+
+
+def make_student(name, points=0):
+    user = User.objects.create_student(
+        f"{name}@example.com", name, None, first_name=name, last_name="Test", phone="0",
+    )
+    Student.objects.filter(pk=user.pk).update(points=points)
+    return user
+
+
+class IndexableSkipListTests(SimpleTestCase):
+
+    def test_matches_sorted_list_under_random_operations(self):
+        rng = random.Random(0)
+        for trial in range(300):
+            initial = rng.sample(range(1000), rng.randint(0, 50))
+            skip_list = IndexableSkipList(initial)
+            expected = sorted(initial)
+            for _ in range(60):
+                if expected and rng.random() < 0.4:
+                    key = rng.choice(expected)
+                    skip_list.remove(key)
+                    expected.remove(key)
+                else:
+                    key = rng.randrange(1000)
+                    if key not in expected:
+                        skip_list.add(key)
+                        expected.append(key)
+                        expected.sort()
+            with self.subTest(trial=trial):
+                self.assertEqual(list(skip_list), expected)
+                self.assertEqual(len(skip_list), len(expected))
+                for position, key in enumerate(expected):
+                    self.assertEqual(skip_list.index(key), position)
+                    self.assertEqual(skip_list[position], key)
+                start = rng.randint(0, len(expected) + 2)
+                self.assertEqual(skip_list.islice(start, 7), expected[start:start + 7])
+
+    def test_missing_keys(self):
+        skip_list = IndexableSkipList([1, 3])
+        with self.assertRaises(KeyError):
+            skip_list.index(2)
+        with self.assertRaises(KeyError):
+            skip_list.remove(2)
+        with self.assertRaises(IndexError):
+            skip_list[2]
+
+
+class LeaderboardTests(SimpleTestCase):
+
+    def test_ranks_by_points_then_user_id(self):
+        board = Leaderboard([(1, 10), (2, 30), (3, 10)])
+        self.assertEqual(board.top(10), [(1, 2, 30), (2, 1, 10), (3, 3, 10)])
+        board.update(3, 40)
+        self.assertEqual(board.rank(3), 1)
+        board.discard(2)
+        self.assertEqual(board.top(10), [(1, 3, 40), (2, 1, 10)])
+        self.assertIsNone(board.rank(2))
+
+    def test_update_with_expression_leaves_board_intact(self):
+        board = Leaderboard([(1, 10), (2, 20)])
+        with self.assertRaises(TypeError):
+            board.update(1, F("points") + 5)
+        self.assertEqual(board.rank(1), 2)
+        self.assertEqual(board.points(1), 10)
+
+
+class LeaderboardRegistryTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        patcher = mock.patch("accounts.leaderboard.SYNC_INTERVAL", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.registry = self.make_registry()
+
+    def make_registry(self, rows=None):
+        registry = LeaderboardRegistry(background=False)
+        registry.register_loader(None, lambda: list(rows or []))
+        registry.register_loader("course", self.load_course)
+        return registry
+
+    @staticmethod
+    def load_course(course_id):
+        if course_id > 100:
+            raise LookupError(course_id)
+        return [(course_id, course_id)]
+
+    def test_unknown_scope_is_not_kept(self):
+        with self.assertRaises(LookupError):
+            self.registry.get(("course", 101))
+        self.assertEqual(self.registry.loaded(), [])
+
+    @override_settings(LEADERBOARD_MAX_BOARDS=2)
+    def test_least_recently_read_boards_are_evicted(self):
+        self.registry.get()
+        for course_id in (1, 2, 3):
+            self.registry.get(("course", course_id))
+        self.registry.get(("course", 2))
+        self.registry.get(("course", 4))
+        self.assertEqual(
+            [scope for scope, _ in self.registry.loaded()],
+            [None, ("course", 2), ("course", 4)],
+        )
+
+    def test_replays_changes_published_by_another_process(self):
+        other = self.make_registry()
+        self.registry.get()
+        self.registry.get(("course", 1))
+        self.registry.get(("course", 2))
+        other.publish([(7, 70, None), (8, 80, [("course", 2)]), (1, 15, None)])
+        other.publish([(7, None, None)])
+
+        self.assertIsNone(self.registry.get().rank(7))
+        self.assertEqual(self.registry.get().top(10), [(1, 8, 80), (2, 1, 15)])
+        self.assertEqual(self.registry.get(("course", 1)).top(10), [(1, 1, 15)])
+        self.assertEqual(self.registry.get(("course", 2)).top(10), [(1, 8, 80), (2, 2, 2)])
+
+    def test_invalidate_reloads_from_the_database(self):
+        rows = [(1, 5)]
+        registry = self.make_registry(rows)
+        board = registry.get()
+        rows[:] = [(1, 9)]
+        self.registry.invalidate()
+        self.assertIs(registry.get(), board)
+        self.assertEqual(board.points(1), 9)
+
+    def test_lost_log_entry_reloads_after_grace_period(self):
+        rows = [(1, 5)]
+        registry = self.make_registry(rows)
+        board = registry.get()
+        rows[:] = [(1, 9)]
+        self.registry.publish([(1, 9, None)])
+        cache.delete(CHANGE_KEY % current_seq())
+        registry.get()
+        self.assertEqual(board.points(1), 5)
+        with mock.patch("accounts.leaderboard.GAP_GRACE", -1):
+            registry.get()
+        self.assertEqual(board.points(1), 9)
+
+    def test_old_boards_are_reloaded(self):
+        rows = [(1, 5)]
+        registry = self.make_registry(rows)
+        board = registry.get()
+        rows[:] = [(1, 9)]
+        board.built_at -= 601
+        registry.get()
+        self.assertEqual(board.points(1), 9)
+
+
+class LeaderboardSignalTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        leaderboards.clear()
+        self.addCleanup(leaderboards.clear)
+        self.alice = make_student("alice", 10)
+        self.bob = make_student("bob", 20)
+
+    def test_f_expression_save_updates_board(self):
+        board = leaderboards.get()
+        student = Student.objects.get(pk=self.alice.pk)
+        student.points = F("points") + 15
+        with self.captureOnCommitCallbacks(execute=True):
+            student.save()
+        self.assertEqual(student.points, 25)
+        self.assertEqual(board.points(self.alice.pk), 25)
+        self.assertEqual(board.rank(self.alice.pk), 1)
+        self.assertEqual(board.rank(self.bob.pk), 2)
+
+    def test_soft_deleted_user_leaves_board(self):
+        board = leaderboards.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bob.soft_delete()
+        self.assertIsNone(board.rank(self.bob.pk))
+        self.assertEqual(len(board), 1)
+
+    def test_restored_user_returns_to_board(self):
+        board = leaderboards.get()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bob.soft_delete()
+        user = User.all_objects.get(pk=self.bob.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            user.restore()
+        self.assertEqual(board.rank(self.bob.pk), 1)
+        self.assertEqual(board.points(self.bob.pk), 20)
+
+    def test_unknown_course_is_not_found(self):
+        response = self.client.get("/api/accounts/leaderboard/", {"course": 12345})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(leaderboards.loaded(), [])
+
+
+class StudentRegistrationTests(TestCase):
+
+    def test_soft_deleted_user_keeps_email_and_username(self):
+        make_student("carol").soft_delete()
+        response = self.client.post("/api/accounts/register/", {
+            "email": "carol@example.com", "username": "carol", "first_name": "C",
+            "last_name": "Test", "phone": "0", "password": "s3cret-pass",
+        }, content_type="application/json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {"email", "username"})
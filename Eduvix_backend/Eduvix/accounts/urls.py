@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import LoginView,StudentRegistrationView,LogoutView,SendOTPView,VerifyOTPView,RefreshTokenView
+from .views import LoginView,StudentRegistrationView,LogoutView,SendOTPView,VerifyOTPView,RefreshTokenView,LeaderboardView,MyRankView
 
 urlpatterns = [
     path('login/', LoginView.as_view(), name='login'),
@@ -7,5 +7,7 @@ urlpatterns = [
     path('logout/',LogoutView.as_view(),name='logout'),
     path('otp/send/', SendOTPView.as_view(), name='otp-send'),
     path('otp/verify/', VerifyOTPView.as_view(), name='otp-verify'),
-    path('token/refresh/', RefreshTokenView.as_view(), name='refresh-token')
+    path('token/refresh/', RefreshTokenView.as_view(), name='refresh-token'),
+    path('leaderboard/', LeaderboardView.as_view(), name='leaderboard'),
+    path('leaderboard/me/', MyRankView.as_view(), name='leaderboard-me'),
 ]
\ No newline at end of file
@@ -1,13 +1,12 @@
 import hashlib,random,base64,hmac,time
-from Eduvix.settings import SECRET_KEY
-from django.core.mail import send_mail
+from django.conf import settings
 
 
 def generate_otp(email):
     otp=f"{random.randint(0, 999999):06}"
     timestamp = int(time.time())
     msg=f"{otp}{timestamp}{email}".encode()
-    signature=hmac.new(SECRET_KEY.encode(),msg,hashlib.sha256).hexdigest()
+    signature=hmac.new(settings.SECRET_KEY.encode(),msg,hashlib.sha256).hexdigest()
     token=f"{timestamp}:{email}:{signature}"
     return token,otp
 
@@ -24,7 +23,7 @@ def verify_otp(request_email,otp,token,valid_minutes=3):
             return False
         
         msg=f"{otp}{timestamp}{email}".encode()
-        expected_signature=hmac.new(SECRET_KEY.encode(),msg,hashlib.sha256).hexdigest()
+        expected_signature=hmac.new(settings.SECRET_KEY.encode(),msg,hashlib.sha256).hexdigest()
         
         return hmac.compare_digest(signature, expected_signature)
 
@@ -32,6 +31,9 @@ def verify_otp(request_email,otp,token,valid_minutes=3):
         return False
         
 def send_otp_email(email, otp):
+    # django.core.mail pulls in smtplib/ssl/email; only load it when sending.
+    from django.core.mail import send_mail
+
     subject = 'Your Eduvix Verification Code'
     
     plain_message = f"Hello,\nYour verification code for Eduvix is: {otp}\nThis code is valid for 3 minutes. Do not share it with anyone."
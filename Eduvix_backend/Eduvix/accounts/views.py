@@ -4,6 +4,8 @@ from rest_framework import status
 from .serializers import LoginSerializer,StudentRegistrationSerializer,SendOTPSerializer,VerifyOTPSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
 from .models import User
+from .leaderboard import leaderboards
+from Eduvix import thumbnails
 from rest_framework.throttling import AnonRateThrottle
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.exceptions import TokenError, InvalidToken
@@ -133,7 +135,7 @@ class VerifyOTPView(APIView):
             email = serializer.validated_data['email']
             
             try:
-                user = User.objects.get(email=email)
+                user = User.objects.active().get(email=email)
             except User.DoesNotExist:
                 return Response(
                     {"error": "User not found"},
@@ -189,4 +191,82 @@ class RefreshTokenView(APIView):
             return Response(
                 {"detail": "Invalid or expired refresh token"},
                 status=status.HTTP_401_UNAUTHORIZED
-            )
\ No newline at end of file
+            )
+
+
+def _leaderboard_scope(request):
+    course_id = request.query_params.get("course")
+    if course_id is None:
+        return None
+    return ("course", int(course_id))
+
+
+class LeaderboardView(APIView):
+    def get(self, request):
+        try:
+            limit = min(int(request.query_params.get("limit", 10)), 100)
+            offset = max(int(request.query_params.get("offset", 0)), 0)
+            board = leaderboards.get(_leaderboard_scope(request))
+        except ValueError:
+            return Response(
+                {"detail": "limit, offset and course must be integers"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except LookupError:
+            return Response(
+                {"detail": "Leaderboard not available"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        rows = board.top(limit, offset)
+        users = list(
+            User.objects.filter(pk__in=[user_id for _, user_id, _ in rows])
+            .values("id", "username", "avatar")
+        )
+        thumbnails.add_thumbnail_urls(users, "avatar", "avatar", "avatar_thumbnail")
+        users = {user["id"]: user for user in users}
+
+        return Response({
+            "total": len(board),
+            "results": [
+                {
+                    "rank": rank,
+                    "username": users.get(user_id, {}).get("username"),
+                    "avatar": users.get(user_id, {}).get("avatar_thumbnail"),
+                    "points": points,
+                }
+                for rank, user_id, points in rows
+            ]
+        }, status=status.HTTP_200_OK)
+
+
+class MyRankView(APIView):
+
+    permission_classes=[IsAuthenticated]
+
+    def get(self, request):
+        try:
+            board = leaderboards.get(_leaderboard_scope(request))
+        except ValueError:
+            return Response(
+                {"detail": "course must be an integer"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        except LookupError:
+            return Response(
+                {"detail": "Leaderboard not available"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        rank = board.rank(request.user.pk)
+        if rank is None:
+            return Response(
+                {"detail": "You are not ranked on this leaderboard"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        return Response({
+            "rank": rank,
+            "total": len(board),
+            "points": board.points(request.user.pk),
+        }, status=status.HTTP_200_OK)
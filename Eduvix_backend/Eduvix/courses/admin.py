@@ -1,3 +1,10 @@
 from django.contrib import admin
+from Eduvix.admin import SoftDeleteAdmin
+from .models import Category, Course, Wallet, Transaction, CoinTransaction, Enrollment
 
-# Register your models here.
+admin.site.register(Category)
+admin.site.register(Course, SoftDeleteAdmin)
+admin.site.register(Wallet)
+admin.site.register(Transaction, SoftDeleteAdmin)
+admin.site.register(CoinTransaction)
+admin.site.register(Enrollment, SoftDeleteAdmin)
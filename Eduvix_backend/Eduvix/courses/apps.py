@@ -3,3 +3,15 @@ from django.apps import AppConfig
 
 class CoursesConfig(AppConfig):
     name = 'courses'
+
+    def ready(self):
+        from Eduvix import http_cache, thumbnails
+        from accounts.leaderboard import leaderboards
+        from accounts.models import User
+        from .leaderboard import course_ids_of_student, load_course_rows
+        from .models import Category, Course
+        http_cache.track_models(Category, Course)
+        # Course responses embed the teacher's username.
+        http_cache.track_models(User, fields=("username",))
+        leaderboards.register_loader("course", load_course_rows, memberships=course_ids_of_student)
+        thumbnails.register("course", Course, "photo")
@@ -0,0 +1,26 @@
+from accounts.leaderboard import leaderboards
+from accounts.models import Student
+from .models import Course, Enrollment
+
+
+def load_course_rows(course_id):
+    # Checked first so arbitrary ids in ?course= never get a board.
+    if not Course.objects.published().filter(pk=course_id).exists():
+        raise LookupError(f"No published course {course_id}")
+    return (
+        Enrollment.objects.filter(course_id=course_id, student__user__deleted_at__isnull=True)
+        .values_list("student_id", "student__points")
+        .iterator(chunk_size=10000)
+    )
+
+
+def course_ids_of_student(student_id):
+    return Enrollment.objects.filter(student_id=student_id).values_list("course_id", flat=True)
+
+
+def add_enrollees(course_id, student_ids):
+    scopes = [("course", course_id)]
+    leaderboards.publish([
+        (student_id, points, scopes)
+        for student_id, points in Student.objects.filter(pk__in=student_ids).values_list("pk", "points")
+    ])
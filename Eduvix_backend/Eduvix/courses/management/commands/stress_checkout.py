@@ -0,0 +1,145 @@
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+from django.db.models import Count, Sum
+
+from accounts.models import Teacher, User
+from courses.models import Category, CoinTransaction, Course, Enrollment, Transaction, Wallet
+from courses.services import CheckoutError, enroll_cohort, purchase_course
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire concurrent purchases, retries and cohort gifts at the checkout service "
+        "and verify there are no duplicate enrollments, double charges or deadlocks. "
+        "Run it against PostgreSQL; SQLite serializes writers and only checks the bookkeeping."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=50)
+        parser.add_argument("--courses", type=int, default=3)
+        parser.add_argument("--threads", type=int, default=16)
+        parser.add_argument("--requests", type=int, default=1000)
+        parser.add_argument("--cohort-share", type=float, default=0.1,
+                            help="Fraction of requests that are cohort gifts.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--keep", action="store_true", help="Keep the generated rows.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        tag = uuid.uuid4().hex[:8]
+        price = Decimal("3.00")
+
+        teacher_user = User.objects.create_teacher(
+            f"stress-{tag}-t@example.com", f"stress-{tag}-t", None,
+            first_name="Stress", last_name="Teacher", phone="0",
+        )
+        category = Category.objects.create(name=f"stress-{tag}")
+        courses = [
+            Course.objects.create(teacher=teacher_user.teacher, category=category,
+                                  title=f"stress-{tag}-{i}", price=price, is_published=True)
+            for i in range(options["courses"])
+        ]
+        students = [
+            User.objects.create_student(
+                f"stress-{tag}-{i}@example.com", f"stress-{tag}-{i}", None,
+                first_name="Stress", last_name="Student", phone="0",
+            )
+            for i in range(options["students"])
+        ]
+        users = {user.pk: user for user in students + [teacher_user]}
+        starting = {user.pk: price * options["courses"] * 2 for user in students}
+        starting[teacher_user.pk] = price * options["courses"] * options["students"]
+        Wallet.objects.bulk_create(Wallet(user_id=pk, balance=balance) for pk, balance in starting.items())
+
+        jobs = []
+        for _ in range(options["requests"]):
+            course = rng.choice(courses)
+            if rng.random() < options["cohort_share"]:
+                cohort = rng.sample([user.pk for user in students], k=min(5, len(students)))
+                jobs.append(("cohort", teacher_user.pk, course.pk, cohort, f"cohort-{rng.randrange(20)}"))
+            else:
+                student = rng.choice(students)
+                # A small key space per student/course makes retries and double-clicks common.
+                key = f"{course.pk}-{rng.randrange(2)}" if rng.random() < 0.8 else None
+                jobs.append(("single", student.pk, course.pk, [student.pk], key))
+
+        outcomes = Counter()
+        lock = threading.Lock()
+
+        def worker(chunk):
+            try:
+                for kind, payer_id, course_id, student_ids, key in chunk:
+                    try:
+                        if kind == "single":
+                            result = purchase_course(users[payer_id], course_id, idempotency_key=key)
+                        else:
+                            result = enroll_cohort(users[payer_id], course_id, student_ids, idempotency_key=key)
+                        outcome = "purchased" if result.purchased else "no-op"
+                    except CheckoutError as exc:
+                        outcome = type(exc).__name__
+                    except OperationalError as exc:
+                        outcome = "deadlock" if "deadlock" in str(exc).lower() else "database error"
+                    with lock:
+                        outcomes[outcome] += 1
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=worker, args=(jobs[i::options["threads"]],))
+            for i in range(options["threads"])
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        self.stdout.write(f"{len(jobs)} requests on {options['threads']} threads in {elapsed:.2f}s")
+        for outcome, count in outcomes.most_common():
+            self.stdout.write(f"  {count:>6}  {outcome}")
+
+        problems = self._verify(courses, starting, teacher_user, outcomes)
+        if not options["keep"]:
+            User.all_objects.filter(pk__in=list(users)).delete()
+            category.delete()
+
+        if problems:
+            raise CommandError("\n".join(problems))
+        self.stdout.write(self.style.SUCCESS("no duplicate enrollments, double charges or deadlocks"))
+
+    def _verify(self, courses, starting, teacher_user, outcomes):
+        problems = []
+        for outcome in ("deadlock", "database error"):
+            if outcomes[outcome]:
+                problems.append(f"{outcomes[outcome]} requests failed with a {outcome}")
+
+        enrollments = Enrollment.all_objects.filter(course__in=courses)
+        duplicates = enrollments.values("student", "course").annotate(n=Count("id")).filter(n__gt=1)
+        if duplicates:
+            problems.append(f"duplicate enrollments: {list(duplicates)}")
+
+        transactions = Transaction.all_objects.filter(course__in=courses, status="completed")
+        charged_twice = transactions.values("student", "course").annotate(n=Count("id")).filter(n__gt=1)
+        if charged_twice:
+            problems.append(f"students charged twice: {list(charged_twice)}")
+        if transactions.count() != enrollments.count():
+            problems.append(f"{transactions.count()} purchases for {enrollments.count()} enrollments")
+
+        for wallet in Wallet.objects.filter(user_id__in=list(starting)):
+            spent = CoinTransaction.objects.filter(wallet=wallet).aggregate(total=Sum("amount"))["total"] or 0
+            if wallet.balance != starting[wallet.user_id] - spent:
+                problems.append(f"wallet {wallet.pk}: balance {wallet.balance} does not match its ledger")
+
+        teacher = Teacher.objects.get(pk=teacher_user.pk)
+        earned = transactions.aggregate(total=Sum("amount"))["total"] or 0
+        if teacher.total_earned + teacher.total_commission != earned:
+            problems.append(f"teacher booked {teacher.total_earned + teacher.total_commission}, sales were {earned}")
+        return problems
@@ -0,0 +1,17 @@
+# Generated by Django 6.0.2 on 2026-10-19 15:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('is_published', True)), fields=['title'], name='idx_courses_active_title'),
+        ),
+    ]
@@ -1,3 +1,182 @@
 from django.db import models
+from django.utils import timezone
+from accounts.models import Student, Teacher, User
+from Eduvix.soft_delete import ALIVE, SoftDeleteManager, SoftDeleteMixin, SoftDeleteQuerySet
 
-# Create your models here.
+
+class Category(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    description = models.TextField(blank=True, null=True)
+    parent = models.ForeignKey("self", on_delete=models.SET_NULL, null=True, blank=True, related_name="children")
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "categories"
+
+    def __str__(self):
+        return self.name
+
+
+class CourseQuerySet(SoftDeleteQuerySet):
+    def published(self):
+        # Matches the idx_courses_active_title partial index predicate.
+        return self.filter(ALIVE, is_published=True)
+
+
+class CourseManager(SoftDeleteManager.from_queryset(CourseQuerySet)):
+    pass
+
+
+class Course(SoftDeleteMixin, models.Model):
+    teacher = models.ForeignKey(Teacher, on_delete=models.CASCADE, related_name="courses")
+    category = models.ForeignKey(Category, on_delete=models.PROTECT, related_name="courses")
+    title = models.CharField(max_length=255)
+    description = models.TextField(blank=True, null=True)
+    photo = models.TextField(blank=True, null=True)
+    price = models.DecimalField(max_digits=12, decimal_places=2, default=0.0)
+    is_published = models.BooleanField(default=False)
+    rating = models.DecimalField(max_digits=3, decimal_places=2, default=0.0)
+    total_reviews = models.IntegerField(default=0)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = CourseManager()
+    all_objects = CourseQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(condition=models.Q(price__gte=0), name="course_price_non_negative"),
+        ]
+        indexes = [
+            models.Index(
+                fields=["title"],
+                name="idx_courses_active_title",
+                condition=ALIVE & models.Q(is_published=True),
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class Wallet(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="wallet")
+    balance = models.DecimalField(max_digits=12, decimal_places=2, default=0.0)
+    is_locked = models.BooleanField(default=False)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(condition=models.Q(balance__gte=0), name="wallet_balance_non_negative"),
+        ]
+
+    def __str__(self):
+        return f"Wallet of {self.user.username}: {self.balance}"
+
+
+class Transaction(SoftDeleteMixin, models.Model):
+    STATUS_CHOICES = (
+        ("pending", "Pending"),
+        ("completed", "Completed"),
+        ("failed", "Failed"),
+        ("refunded", "Refunded"),
+    )
+
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="transactions")
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="transactions")
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    payment_method = models.CharField(max_length=30, blank=True, null=True)
+    idempotency_key = models.CharField(max_length=255, blank=True, null=True)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    objects = SoftDeleteManager()
+    all_objects = SoftDeleteQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(condition=models.Q(amount__gte=0), name="transaction_amount_non_negative"),
+            models.UniqueConstraint(
+                fields=["idempotency_key", "student"],
+                condition=models.Q(idempotency_key__isnull=False),
+                name="uniq_transaction_idempotency_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} -> {self.course_id}: {self.amount} ({self.status})"
+
+
+COIN_CREDIT_TYPES = ("deposit", "refund")
+COIN_DEBIT_TYPES = ("withdraw", "commission", "purchase")
+
+
+class CoinTransaction(models.Model):
+    TYPE_CHOICES = (
+        ("purchase", "Purchase"),
+        ("commission", "Commission"),
+        ("refund", "Refund"),
+        ("withdraw", "Withdraw"),
+        ("deposit", "Deposit"),
+    )
+
+    wallet = models.ForeignKey(Wallet, on_delete=models.CASCADE, related_name="coin_transactions")
+    transaction = models.ForeignKey(Transaction, on_delete=models.SET_NULL, null=True, blank=True, related_name="coin_transactions")
+    type = models.CharField(max_length=20, choices=TYPE_CHOICES)
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    balance_before = models.DecimalField(max_digits=12, decimal_places=2)
+    balance_after = models.DecimalField(max_digits=12, decimal_places=2)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(condition=models.Q(amount__gt=0), name="coin_transaction_amount_positive"),
+            models.CheckConstraint(
+                condition=(
+                    models.Q(type__in=COIN_CREDIT_TYPES, balance_after=models.F("balance_before") + models.F("amount"))
+                    | models.Q(type__in=COIN_DEBIT_TYPES, balance_after=models.F("balance_before") - models.F("amount"))
+                ),
+                name="chk_balance_consistency",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.type} {self.amount} on wallet {self.wallet_id}"
+
+
+class Enrollment(SoftDeleteMixin, models.Model):
+    STATUS_CHOICES = (
+        ("active", "Active"),
+        ("completed", "Completed"),
+        ("cancelled", "Cancelled"),
+        ("refunded", "Refunded"),
+    )
+
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name="enrollments")
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name="enrollments")
+    transaction = models.ForeignKey(Transaction, on_delete=models.SET_NULL, null=True, blank=True, related_name="enrollments")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="active")
+    course_progress = models.DecimalField(max_digits=5, decimal_places=2, default=0.0)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    enrolled_at = models.DateTimeField(default=timezone.now)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    objects = SoftDeleteManager()
+    all_objects = SoftDeleteQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["student", "course"], name="uniq_enrollment_student_course"),
+            models.CheckConstraint(
+                condition=models.Q(course_progress__gte=0, course_progress__lte=100),
+                name="enrollment_progress_range",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} in {self.course_id} ({self.status})"
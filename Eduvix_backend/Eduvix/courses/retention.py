@@ -0,0 +1,10 @@
+from datetime import timedelta
+
+from Eduvix import retention
+from .models import Course, Enrollment, Transaction
+
+retention.register(Course, age_field="deleted_at", max_age=timedelta(days=30))
+
+retention.register(Enrollment, age_field="deleted_at", max_age=timedelta(days=30))
+
+retention.register(Transaction, age_field="deleted_at", max_age=timedelta(days=30))
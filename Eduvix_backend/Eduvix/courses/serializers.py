@@ -0,0 +1,42 @@
+from rest_framework import serializers
+from Eduvix import thumbnails
+from Eduvix.serializers import ValuesSerializer
+
+
+class CategorySerializer(ValuesSerializer):
+    fields = ("id", "name", "description", "parent_id")
+
+
+class CourseListSerializer(ValuesSerializer):
+    fields = (
+        "id", "title", "photo", "price", "rating", "total_reviews",
+        ("category_name", "category__name"),
+        ("teacher_username", "teacher__user__username"),
+    )
+
+    def finalize(self, rows):
+        return thumbnails.add_thumbnail_urls(rows, "course", "photo", "photo_thumbnail")
+
+
+class CourseDetailSerializer(ValuesSerializer):
+    fields = (
+        "id", "title", "description", "photo", "price", "rating", "total_reviews",
+        "category_id", "created_at", "updated_at",
+        ("category_name", "category__name"),
+        ("teacher_username", "teacher__user__username"),
+    )
+
+    def finalize(self, rows):
+        return thumbnails.add_thumbnail_urls(rows, "course", "photo", "photo_thumbnail", size="medium")
+
+
+class EnrollmentSerializer(ValuesSerializer):
+    fields = ("student_id", "course_id", "transaction_id", "status", "enrolled_at")
+
+
+class EnrollCohortSerializer(serializers.Serializer):
+    student_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000,
+    )
@@ -0,0 +1,229 @@
+"""
+Course checkout.
+
+Every purchase runs in one database transaction and takes its row locks in a
+fixed order: the recipients' ``Student`` rows by primary key, then the
+payer's ``Wallet``, then the course's ``Teacher``. Concurrent purchases
+therefore queue up behind each other instead of deadlocking, and the
+enrollment check made under the student locks is authoritative.
+
+Only the course's teacher or an admin may pay for other students.
+
+Requests may carry a client idempotency key (scoped to the payer). A replayed
+key is answered from the stored transactions before any write transaction is
+opened, so double-clicks and retries cost one indexed read.
+"""
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from accounts.models import AuditLog, Student, Teacher
+from .leaderboard import add_enrollees
+from .models import CoinTransaction, Course, Enrollment, Transaction, Wallet
+
+CENTS = Decimal("0.01")
+
+
+class CheckoutError(Exception):
+    status_code = 400
+
+
+class CourseUnavailable(CheckoutError):
+    status_code = 404
+
+
+class UnknownStudents(CheckoutError):
+    status_code = 400
+
+
+class CohortNotAllowed(CheckoutError):
+    status_code = 403
+
+
+class InsufficientBalance(CheckoutError):
+    status_code = 402
+
+
+class WalletLocked(CheckoutError):
+    status_code = 423
+
+
+class IdempotencyKeyReused(CheckoutError):
+    status_code = 409
+
+
+@dataclass
+class PurchaseResult:
+    course_id: int
+    student_ids: list
+    # False when every student was already enrolled (or the key was replayed).
+    purchased: bool
+
+    @property
+    def enrollments(self):
+        return Enrollment.objects.filter(course_id=self.course_id, student_id__in=self.student_ids)
+
+
+def _replay(key, course_id, student_ids):
+    stored = list(Transaction.all_objects.filter(idempotency_key=key).values_list("course_id", "student_id"))
+    if not stored:
+        return None
+    reused = IdempotencyKeyReused("This idempotency key was already used for a different purchase.")
+    if any(stored_course != course_id or student_id not in student_ids for stored_course, student_id in stored):
+        raise reused
+    # Students the original request skipped must have been enrolled already;
+    # anyone else is new to this key and was never paid for.
+    uncovered = set(student_ids).difference(student_id for _, student_id in stored)
+    if uncovered:
+        enrolled = Enrollment.objects.filter(course_id=course_id, student_id__in=uncovered).count()
+        if enrolled != len(uncovered):
+            raise reused
+    return PurchaseResult(course_id, student_ids, purchased=False)
+
+
+def _may_enroll_others(payer, course):
+    return payer.is_staff or payer.role == "admin" or payer.pk == course.teacher_id
+
+
+def _commission(amount):
+    rate = Decimal(str(getattr(settings, "COURSE_COMMISSION_RATE", "0")))
+    return (amount * rate).quantize(CENTS)
+
+
+def purchase_course(user, course_id, idempotency_key=None, payment_method="wallet"):
+    """Buy ``course_id`` for ``user`` (a student) from their own wallet."""
+    return enroll_cohort(user, course_id, [user.pk], idempotency_key, payment_method)
+
+
+def enroll_cohort(payer, course_id, student_ids, idempotency_key=None, payment_method="wallet"):
+    """
+    Buy ``course_id`` for every student in ``student_ids``, charged to the
+    ``payer``'s wallet. Students who are already enrolled are skipped; all
+    rows for the rest are written with one statement per table. Anyone but
+    the course's teacher or an admin may only enroll themselves.
+    """
+    student_ids = sorted(set(student_ids))
+    key = f"{payer.pk}:{idempotency_key}" if idempotency_key else None
+
+    if key:
+        replay = _replay(key, course_id, student_ids)
+        if replay is not None:
+            return replay
+
+    course = Course.objects.published().filter(pk=course_id).first()
+    if course is None:
+        raise CourseUnavailable("Course not found.")
+    if student_ids != [payer.pk] and not _may_enroll_others(payer, course):
+        raise CohortNotAllowed("Only the course's teacher or an admin can enroll other students.")
+
+    # Nothing to buy: answer without opening a write transaction.
+    enrolled = set(Enrollment.objects.filter(course=course, student_id__in=student_ids)
+                   .values_list("student_id", flat=True))
+    if enrolled.issuperset(student_ids):
+        return PurchaseResult(course.pk, student_ids, purchased=False)
+
+    try:
+        with transaction.atomic():
+            return _checkout(payer, course, student_ids, key, payment_method)
+    except IntegrityError:
+        if key:
+            replay = _replay(key, course_id, student_ids)
+            if replay is not None:
+                return replay
+        raise
+
+
+def _checkout(payer, course, student_ids, key, payment_method):
+    # Lock order: students -> payer wallet -> teacher. Keep it that way.
+    locked = list(Student.objects.select_for_update().filter(pk__in=student_ids)
+                  .order_by("pk").values_list("pk", flat=True))
+    if len(locked) != len(student_ids):
+        # Deliberately vague: naming the missing ids would let callers probe
+        # which user ids belong to students.
+        raise UnknownStudents("Some of these students cannot be enrolled.")
+
+    if key:
+        replay = _replay(key, course.pk, student_ids)
+        if replay is not None:
+            return replay
+
+    enrolled = set(Enrollment.objects.filter(course=course, student_id__in=student_ids)
+                   .values_list("student_id", flat=True))
+    new_ids = [student_id for student_id in student_ids if student_id not in enrolled]
+    if not new_ids:
+        return PurchaseResult(course.pk, student_ids, purchased=False)
+
+    price = course.price
+    total = price * len(new_ids)
+    now = timezone.now()
+
+    wallet = None
+    if total > 0:
+        wallet = Wallet.objects.select_for_update().filter(user=payer).first()
+        if wallet is None or wallet.balance < total:
+            raise InsufficientBalance("Insufficient wallet balance.")
+        if wallet.is_locked:
+            raise WalletLocked("Wallet is locked.")
+
+    transactions = Transaction.objects.bulk_create([
+        Transaction(
+            student_id=student_id,
+            course=course,
+            amount=price,
+            status="completed",
+            payment_method=payment_method if total > 0 else None,
+            idempotency_key=key,
+            created_at=now,
+            completed_at=now,
+        )
+        for student_id in new_ids
+    ])
+
+    if wallet is not None:
+        balance = wallet.balance
+        coin_transactions = []
+        for purchase in transactions:
+            coin_transactions.append(CoinTransaction(
+                wallet=wallet,
+                transaction=purchase,
+                type="purchase",
+                amount=price,
+                balance_before=balance,
+                balance_after=balance - price,
+                created_at=now,
+            ))
+            balance -= price
+        CoinTransaction.objects.bulk_create(coin_transactions)
+        Wallet.objects.filter(pk=wallet.pk).update(balance=balance, updated_at=now)
+        AuditLog.objects.create(
+            table_name=Wallet._meta.db_table,
+            record_id=wallet.pk,
+            action_type="UPDATE",
+            old_data={"balance": str(wallet.balance)},
+            new_data={"balance": str(balance)},
+            changed_by=payer,
+        )
+
+        commission = _commission(total)
+        Teacher.objects.filter(pk=course.teacher_id).update(
+            total_earned=F("total_earned") + (total - commission),
+            total_commission=F("total_commission") + commission,
+        )
+
+    # Soft-deleted enrollments for the same student/course are revived.
+    Enrollment.all_objects.bulk_create(
+        [
+            Enrollment(student_id=purchase.student_id, course=course, transaction=purchase, enrolled_at=now)
+            for purchase in transactions
+        ],
+        update_conflicts=True,
+        unique_fields=["student", "course"],
+        update_fields=["transaction", "status", "course_progress", "deleted_at", "enrolled_at", "completed_at"],
+    )
+
+    transaction.on_commit(lambda: add_enrollees(course.pk, new_ids))
+    return PurchaseResult(course.pk, student_ids, purchased=True)
@@ -1,3 +1,222 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import update_last_login
+from django.core.cache import cache
 from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import Teacher, User
+from .models import Category, CoinTransaction, Course, Enrollment, Transaction, Wallet
+from .services import (
+    CohortNotAllowed, IdempotencyKeyReused, InsufficientBalance, UnknownStudents, WalletLocked,
+    enroll_cohort, purchase_course,
+)
+
+
+def make_user(name, role="student", balance=None):
+    create = User.objects.create_teacher if role == "teacher" else User.objects.create_student
+    user = create(f"{name}@example.com", name, None, first_name=name, last_name="Test", phone="0")
+    if balance is not None:
+        Wallet.objects.create(user=user, balance=Decimal(balance))
+    return user
+
+
+class CheckoutTests(TestCase):
+
+    def setUp(self):
+        self.teacher = make_user("teacher", role="teacher", balance="100.00")
+        category = Category.objects.create(name="Math")
+        self.course = Course.objects.create(
+            teacher=self.teacher.teacher, category=category, title="Algebra",
+            price=Decimal("10.00"), is_published=True,
+        )
+        self.other_course = Course.objects.create(
+            teacher=self.teacher.teacher, category=category, title="Geometry",
+            price=Decimal("10.00"), is_published=True,
+        )
+        self.alice = make_user("alice", balance="25.00")
+        self.bob = make_user("bob", balance="5.00")
+
+    def balance(self, user):
+        return Wallet.objects.get(user=user).balance
+
+    def test_purchase_charges_once_and_replays_key(self):
+        first = purchase_course(self.alice, self.course.pk, idempotency_key="k1")
+        replay = purchase_course(self.alice, self.course.pk, idempotency_key="k1")
+
+        self.assertTrue(first.purchased)
+        self.assertFalse(replay.purchased)
+        self.assertEqual(self.balance(self.alice), Decimal("15.00"))
+        self.assertEqual(Transaction.objects.filter(student_id=self.alice.pk).count(), 1)
+        self.assertEqual(CoinTransaction.objects.filter(wallet__user=self.alice).count(), 1)
+        self.assertEqual(list(first.enrollments.values_list("student_id", flat=True)), [self.alice.pk])
+        self.assertEqual(Teacher.objects.get(pk=self.teacher.pk).total_earned, Decimal("10.00"))
+
+    def test_already_enrolled_is_not_charged_again(self):
+        purchase_course(self.alice, self.course.pk)
+        again = purchase_course(self.alice, self.course.pk)
+        self.assertFalse(again.purchased)
+        self.assertEqual(self.balance(self.alice), Decimal("15.00"))
+
+    def test_key_reused_for_another_course(self):
+        purchase_course(self.alice, self.course.pk, idempotency_key="k1")
+        with self.assertRaises(IdempotencyKeyReused):
+            purchase_course(self.alice, self.other_course.pk, idempotency_key="k1")
+        self.assertEqual(self.balance(self.alice), Decimal("15.00"))
+
+    def test_keys_are_scoped_to_the_payer(self):
+        purchase_course(self.alice, self.course.pk, idempotency_key="k1")
+        Wallet.objects.filter(user=self.bob).update(balance=Decimal("10.00"))
+        self.assertTrue(purchase_course(self.bob, self.course.pk, idempotency_key="k1").purchased)
+
+    def test_insufficient_balance(self):
+        with self.assertRaises(InsufficientBalance):
+            purchase_course(self.bob, self.course.pk)
+        self.assertEqual(self.balance(self.bob), Decimal("5.00"))
+        self.assertFalse(Enrollment.objects.filter(student_id=self.bob.pk).exists())
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_locked_wallet(self):
+        Wallet.objects.filter(user=self.alice).update(is_locked=True)
+        with self.assertRaises(WalletLocked):
+            purchase_course(self.alice, self.course.pk)
+        self.assertEqual(self.balance(self.alice), Decimal("25.00"))
+        self.assertFalse(Enrollment.objects.exists())
+
+    def test_soft_deleted_enrollment_is_revived(self):
+        purchase_course(self.alice, self.course.pk)
+        Enrollment.objects.get(student_id=self.alice.pk).soft_delete()
+        self.assertTrue(purchase_course(self.alice, self.course.pk).purchased)
+        self.assertEqual(Enrollment.all_objects.filter(student_id=self.alice.pk).count(), 1)
+        self.assertTrue(Enrollment.objects.filter(student_id=self.alice.pk).exists())
+
+    def test_teacher_enrolls_cohort_in_one_charge(self):
+        purchase_course(self.alice, self.course.pk)
+        result = enroll_cohort(self.teacher, self.course.pk, [self.alice.pk, self.bob.pk], idempotency_key="c1")
+
+        self.assertTrue(result.purchased)
+        # Alice was already enrolled, so only Bob is paid for.
+        self.assertEqual(self.balance(self.teacher), Decimal("90.00"))
+        self.assertEqual(Enrollment.objects.filter(course=self.course).count(), 2)
+        replay = enroll_cohort(self.teacher, self.course.pk, [self.bob.pk, self.alice.pk], idempotency_key="c1")
+        self.assertFalse(replay.purchased)
+
+    def test_key_reused_with_an_extra_student(self):
+        carol = make_user("carol")
+        enroll_cohort(self.teacher, self.course.pk, [self.alice.pk], idempotency_key="c1")
+        with self.assertRaises(IdempotencyKeyReused):
+            enroll_cohort(self.teacher, self.course.pk, [self.alice.pk, carol.pk], idempotency_key="c1")
+        self.assertFalse(Enrollment.objects.filter(student_id=carol.pk).exists())
+        self.assertEqual(self.balance(self.teacher), Decimal("90.00"))
+
+    def test_students_cannot_enroll_others(self):
+        with self.assertRaises(CohortNotAllowed):
+            enroll_cohort(self.alice, self.course.pk, [self.bob.pk])
+        self.assertFalse(Enrollment.objects.exists())
+
+    def test_unknown_students_are_not_named(self):
+        with self.assertRaises(UnknownStudents) as raised:
+            enroll_cohort(self.teacher, self.course.pk, [self.alice.pk, 987654])
+        self.assertNotIn("987654", str(raised.exception))
+        self.assertEqual(self.balance(self.teacher), Decimal("100.00"))
+
+
+class CheckoutViewTests(TestCase):
+
+    def setUp(self):
+        teacher = make_user("teacher", role="teacher")
+        self.course = Course.objects.create(
+            teacher=teacher.teacher, category=Category.objects.create(name="Math"),
+            title="Free course", is_published=True,
+        )
+        self.alice = make_user("alice")
+        self.bob = make_user("bob")
+        self.client = APIClient()
+
+    def test_purchase_then_replay(self):
+        self.client.force_authenticate(self.alice)
+        url = f"/api/courses/{self.course.pk}/purchase/"
+        self.assertEqual(self.client.post(url, HTTP_IDEMPOTENCY_KEY="k").status_code, 201)
+        self.assertEqual(self.client.post(url, HTTP_IDEMPOTENCY_KEY="k").status_code, 200)
+
+    def test_student_cannot_enroll_cohort(self):
+        self.client.force_authenticate(self.alice)
+        response = self.client.post(
+            f"/api/courses/{self.course.pk}/enroll-cohort/", {"student_ids": [self.bob.pk]}, format="json",
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Enrollment.objects.exists())
+
+
+class HttpCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.teacher = make_user("teacher", role="teacher")
+        self.course = Course.objects.create(
+            teacher=self.teacher.teacher, category=Category.objects.create(name="Math"),
+            title="Algebra", price=Decimal("10.00"), is_published=True,
+        )
+        self.client = APIClient()
+
+    def get(self, path="/api/courses/", **headers):
+        return self.client.get(path, headers=headers)
+
+    def assertServedFresh(self, path="/api/courses/"):
+        response = self.get(path)
+        self.assertEqual(response["X-Cache"], "MISS")
+        return response
+
+    def test_matching_etag_is_not_modified(self):
+        self.client.cookies["access_token"] = str(AccessToken.for_user(self.teacher))
+        etag = self.get()["ETag"]
+        response = self.get(If_None_Match=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_anonymous_responses_are_shared(self):
+        first = self.assertServedFresh()
+        second = self.get()
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.json(), first.json())
+        not_modified = self.get(If_None_Match=first["ETag"])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified["X-Cache"], "HIT")
+
+    def test_authenticated_requests_bypass_the_shared_cache(self):
+        self.get()
+        self.client.cookies["access_token"] = str(AccessToken.for_user(self.teacher))
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("X-Cache", response)
+
+    def test_save_invalidates(self):
+        path = f"/api/courses/{self.course.pk}/"
+        etag = self.assertServedFresh(path)["ETag"]
+        self.course.title = "Linear algebra"
+        self.course.save()
+        self.assertEqual(self.assertServedFresh(path).json()["title"], "Linear algebra")
+        self.assertNotEqual(self.get(path, If_None_Match=etag).status_code, 304)
+
+    def test_soft_delete_invalidates(self):
+        self.assertServedFresh()
+        self.course.soft_delete()
+        self.assertEqual(self.assertServedFresh().json()["total"], 0)
+        self.assertEqual(self.get(f"/api/courses/{self.course.pk}/").status_code, 404)
+
+    def test_teacher_rename_invalidates(self):
+        path = f"/api/courses/{self.course.pk}/"
+        list_etag = self.assertServedFresh()["ETag"]
+        detail_etag = self.assertServedFresh(path)["ETag"]
+        self.teacher.username = "renamed"
+        self.teacher.save()
+        self.assertEqual(self.assertServedFresh().json()["results"][0]["teacher_username"], "renamed")
+        self.assertEqual(self.assertServedFresh(path).json()["teacher_username"], "renamed")
+        self.assertEqual(self.get(If_None_Match=list_etag).status_code, 200)
+        self.assertEqual(self.get(path, If_None_Match=detail_etag).status_code, 200)
 
-# Create your tests here.
+    def test_login_does_not_invalidate(self):
+        self.assertServedFresh()
+        update_last_login(None, self.teacher)
+        self.assertEqual(self.get()["X-Cache"], "HIT")
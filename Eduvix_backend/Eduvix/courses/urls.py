@@ -0,0 +1,10 @@
+from django.urls import path
+from .views import CategoryListView,CourseListView,CourseDetailView,PurchaseCourseView,EnrollCohortView
+
+urlpatterns = [
+    path('categories/', CategoryListView.as_view(), name='category-list'),
+    path('', CourseListView.as_view(), name='course-list'),
+    path('<int:pk>/', CourseDetailView.as_view(), name='course-detail'),
+    path('<int:pk>/purchase/', PurchaseCourseView.as_view(), name='course-purchase'),
+    path('<int:pk>/enroll-cohort/', EnrollCohortView.as_view(), name='course-enroll-cohort'),
+]
@@ -1,3 +1,124 @@
-from django.shortcuts import render
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from Eduvix.http_cache import ConditionalGetMixin, queryset_stamp
+from accounts.models import User
+from .models import Category, Course
+from .serializers import CategorySerializer, CourseListSerializer, CourseDetailSerializer, EnrollmentSerializer, EnrollCohortSerializer
+from .services import CheckoutError, enroll_cohort, purchase_course
 
-# Create your views here.
+
+def catalog_queryset():
+    return Course.objects.published()
+
+
+class CategoryListView(ConditionalGetMixin, APIView):
+    cache_models = (Category,)
+    shared_cache_timeout = 60 * 10
+
+    def get_etag_stamps(self, request):
+        return queryset_stamp(Category.objects.all())
+
+    def get(self, request):
+        categories = Category.objects.order_by("name")
+        return Response(CategorySerializer(categories).data, status=status.HTTP_200_OK)
+
+
+class CourseListView(ConditionalGetMixin, APIView):
+    # User: responses embed the teacher's username.
+    cache_models = (Course, Category, User)
+    shared_cache_timeout = 60 * 5
+
+    def get_queryset(self, request):
+        courses = catalog_queryset()
+        category_id = request.query_params.get("category")
+        if category_id is not None:
+            courses = courses.filter(category_id=category_id)
+        return courses
+
+    def get_etag_stamps(self, request):
+        try:
+            return queryset_stamp(self.get_queryset(request), "teacher__user__updated_at") + queryset_stamp(Category.objects.all())
+        except ValueError:
+            return None
+
+    def get(self, request):
+        try:
+            limit = max(min(int(request.query_params.get("limit", 20)), 100), 1)
+            offset = max(int(request.query_params.get("offset", 0)), 0)
+            courses = self.get_queryset(request)
+            total = courses.count()
+        except ValueError:
+            return Response(
+                {"detail": "limit, offset and category must be integers"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        page = courses.order_by("-created_at", "-id")[offset:offset + limit]
+        return Response({
+            "total": total,
+            "results": CourseListSerializer(page).data,
+        }, status=status.HTTP_200_OK)
+
+
+class CourseDetailView(ConditionalGetMixin, APIView):
+    cache_models = (Course, Category, User)
+    shared_cache_timeout = 60 * 5
+
+    def get_etag_stamps(self, request, pk):
+        stamp = catalog_queryset().filter(pk=pk).values_list(
+            "updated_at", "category__updated_at", "teacher__user__updated_at"
+        ).first()
+        if stamp is None:
+            return None
+        return tuple(value.isoformat() for value in stamp)
+
+    def get(self, request, pk):
+        course = CourseDetailSerializer(catalog_queryset().filter(pk=pk), many=False).data
+        if course is None:
+            return Response(
+                {"detail": "Course not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(course, status=status.HTTP_200_OK)
+
+
+def _checkout_response(result):
+    return Response({
+        "purchased": result.purchased,
+        "enrollments": EnrollmentSerializer(result.enrollments.order_by("student_id")).data,
+    }, status=status.HTTP_201_CREATED if result.purchased else status.HTTP_200_OK)
+
+
+class PurchaseCourseView(APIView):
+
+    permission_classes=[IsAuthenticated]
+
+    def post(self, request, pk):
+        try:
+            result = purchase_course(request.user, pk, idempotency_key=request.headers.get("Idempotency-Key"))
+        except CheckoutError as exc:
+            return Response({"detail": str(exc)}, status=exc.status_code)
+        return _checkout_response(result)
+
+
+class EnrollCohortView(APIView):
+
+    permission_classes=[IsAuthenticated]
+
+    def post(self, request, pk):
+        serializer = EnrollCohortSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            result = enroll_cohort(
+                request.user,
+                pk,
+                serializer.validated_data["student_ids"],
+                idempotency_key=request.headers.get("Idempotency-Key"),
+            )
+        except CheckoutError as exc:
+            return Response({"detail": str(exc)}, status=exc.status_code)
+        return _checkout_response(result)
@@ -0,0 +1,5 @@
+from django.contrib import admin
+from Eduvix.admin import SoftDeleteAdmin
+from .models import Book
+
+admin.site.register(Book, SoftDeleteAdmin)
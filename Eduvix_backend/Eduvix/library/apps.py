@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class LibraryConfig(AppConfig):
+    name = 'library'
+
+    def ready(self):
+        from Eduvix import http_cache, thumbnails
+        from .models import Book
+        http_cache.track_models(Book)
+        thumbnails.register("book", Book, "cover")
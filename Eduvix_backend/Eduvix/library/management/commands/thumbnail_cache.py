@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from Eduvix import thumbnails
+
+
+class Command(BaseCommand):
+    help = "Show the size of the thumbnail cache, or trim it to its cap (--prune) or empty it (--clear)."
+
+    def add_arguments(self, parser):
+        action = parser.add_mutually_exclusive_group()
+        action.add_argument("--prune", action="store_true", help="Evict least recently used thumbnails.")
+        action.add_argument("--clear", action="store_true", help="Delete every thumbnail.")
+
+    def handle(self, *args, **options):
+        cache = thumbnails.get_cache()
+        if options["clear"]:
+            self.stdout.write(f"removed {cache.clear()} thumbnails")
+        elif options["prune"]:
+            self.stdout.write(f"removed {cache.prune()} thumbnails")
+
+        files, size = cache.usage()
+        self.stdout.write(f"directory: {cache.directory}")
+        self.stdout.write(
+            f"thumbnails: {files}, {size / 1024 / 1024:.1f} MiB "
+            f"of {cache.max_bytes / 1024 / 1024:.1f} MiB"
+        )
+        if not thumbnails.available():
+            self.stdout.write(self.style.WARNING("Pillow is not installed; clients are sent the original images."))
@@ -0,0 +1,42 @@
+# Generated by Django 6.0.2 on 2026-10-19 16:02
+
+import Eduvix.soft_delete
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('courses', '0003_purchases'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Book',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=255)),
+                ('author', models.CharField(max_length=255)),
+                ('isbn', models.CharField(blank=True, max_length=13, null=True, unique=True)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('cover', models.TextField(blank=True, null=True)),
+                ('file_url', models.TextField(blank=True, null=True)),
+                ('language', models.CharField(blank=True, max_length=50, null=True)),
+                ('pages', models.PositiveIntegerField(blank=True, null=True)),
+                ('published_year', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('is_published', models.BooleanField(default=False)),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='books', to='courses.category')),
+            ],
+            options={
+                'indexes': [models.Index(condition=models.Q(('deleted_at__isnull', True), ('is_published', True)), fields=['title', 'id'], name='idx_books_active_title')],
+            },
+            bases=(Eduvix.soft_delete.SoftDeleteMixin, models.Model),
+        ),
+    ]
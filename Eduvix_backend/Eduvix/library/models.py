@@ -0,0 +1,47 @@
+from django.db import models
+from django.utils import timezone
+from courses.models import Category
+from Eduvix.soft_delete import ALIVE, SoftDeleteManager, SoftDeleteMixin, SoftDeleteQuerySet
+
+
+class BookQuerySet(SoftDeleteQuerySet):
+    def published(self):
+        # Matches the idx_books_active_title partial index predicate.
+        return self.filter(ALIVE, is_published=True)
+
+
+class BookManager(SoftDeleteManager.from_queryset(BookQuerySet)):
+    pass
+
+
+class Book(SoftDeleteMixin, models.Model):
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name="books")
+    title = models.CharField(max_length=255)
+    author = models.CharField(max_length=255)
+    isbn = models.CharField(max_length=13, unique=True, null=True, blank=True)
+    description = models.TextField(blank=True, null=True)
+    cover = models.TextField(blank=True, null=True)
+    file_url = models.TextField(blank=True, null=True)
+    language = models.CharField(max_length=50, blank=True, null=True)
+    pages = models.PositiveIntegerField(null=True, blank=True)
+    published_year = models.PositiveSmallIntegerField(null=True, blank=True)
+    is_published = models.BooleanField(default=False)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = BookManager()
+    all_objects = BookQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Serves the (title, id) keyset pagination of the catalog.
+            models.Index(
+                fields=["title", "id"],
+                name="idx_books_active_title",
+                condition=ALIVE & models.Q(is_published=True),
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
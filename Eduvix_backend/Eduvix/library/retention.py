@@ -0,0 +1,6 @@
+from datetime import timedelta
+
+from Eduvix import retention
+from .models import Book
+
+retention.register(Book, age_field="deleted_at", max_age=timedelta(days=30))
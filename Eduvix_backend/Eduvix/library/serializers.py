@@ -0,0 +1,23 @@
+from Eduvix import thumbnails
+from Eduvix.serializers import ValuesSerializer
+
+
+class BookListSerializer(ValuesSerializer):
+    fields = (
+        "id", "title", "author", "cover", "language", "published_year",
+        ("category_name", "category__name"),
+    )
+
+    def finalize(self, rows):
+        return thumbnails.add_thumbnail_urls(rows, "book", "cover", "cover_thumbnail")
+
+
+class BookDetailSerializer(ValuesSerializer):
+    fields = (
+        "id", "title", "author", "isbn", "description", "cover", "file_url",
+        "language", "pages", "published_year", "category_id", "created_at", "updated_at",
+        ("category_name", "category__name"),
+    )
+
+    def finalize(self, rows):
+        return thumbnails.add_thumbnail_urls(rows, "book", "cover", "cover_thumbnail", size="medium")
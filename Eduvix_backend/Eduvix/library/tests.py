@@ -0,0 +1,44 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from .models import Book
+from .views import decode_cursor, encode_cursor
+
+
+class BookListPagingTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        titles = ["Algebra", "Biology", "Biology", "Biology", "Chemistry", "Drawing"]
+        self.books = [Book.objects.create(title=title, author="A", is_published=True) for title in titles]
+        Book.objects.create(title="Draft", author="A")
+
+    def get(self, **params):
+        return self.client.get("/api/library/books/", params)
+
+    def test_pages_follow_title_then_id(self):
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = self.get(**params)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertLessEqual(len(body["results"]), 2)
+            seen.extend(row["id"] for row in body["results"])
+            cursor = body["next"]
+            if cursor is None:
+                break
+        self.assertEqual(seen, [book.pk for book in self.books])
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor({"title": "Biology", "id": 3})), ("Biology", 3))
+
+    def test_invalid_cursors_are_rejected(self):
+        for cursor in ("not base64!", "bm9wZQ==", encode_cursor({"title": 1, "id": 2}),
+                       encode_cursor({"title": "x", "id": "2"})):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(ValueError):
+                    decode_cursor(cursor)
+                self.assertEqual(self.get(cursor=cursor).status_code, 400)
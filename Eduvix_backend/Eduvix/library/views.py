@@ -0,0 +1,104 @@
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from Eduvix.http_cache import ConditionalGetMixin, queryset_stamp
+from courses.models import Category
+from .models import Book
+from .serializers import BookListSerializer, BookDetailSerializer
+
+
+def catalog_queryset():
+    return Book.objects.published()
+
+
+def encode_cursor(row):
+    return base64.urlsafe_b64encode(json.dumps([row["title"], row["id"]]).encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        title, pk = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, TypeError, ValueError):
+        raise ValueError("invalid cursor")
+    if not isinstance(title, str) or not isinstance(pk, int):
+        raise ValueError("invalid cursor")
+    return title, pk
+
+
+class BookListView(ConditionalGetMixin, APIView):
+    """
+    Books ordered by (title, id), a page at a time. Each page carries a
+    ``next`` cursor holding the last row's sort key, so deep pages cost the
+    same index range scan as the first one instead of an OFFSET scan.
+    """
+    cache_models = (Book, Category)
+    shared_cache_timeout = 60 * 5
+
+    def get_queryset(self, request):
+        books = catalog_queryset()
+        category_id = request.query_params.get("category")
+        if category_id is not None:
+            books = books.filter(category_id=int(category_id))
+        search = request.query_params.get("search")
+        if search:
+            books = books.filter(Q(title__icontains=search) | Q(author__icontains=search))
+        return books
+
+    def get_etag_stamps(self, request):
+        try:
+            return queryset_stamp(self.get_queryset(request)) + queryset_stamp(Category.objects.all())
+        except ValueError:
+            return None
+
+    def get(self, request):
+        try:
+            limit = max(min(int(request.query_params.get("limit", 20)), 100), 1)
+            books = self.get_queryset(request)
+            cursor = request.query_params.get("cursor")
+            if cursor:
+                title, pk = decode_cursor(cursor)
+                # title >= lets the database start the index scan at the
+                # cursor; the OR only trims rows sharing that title.
+                books = books.filter(title__gte=title).filter(Q(title__gt=title) | Q(id__gt=pk))
+        except ValueError:
+            return Response(
+                {"detail": "limit and category must be integers and cursor must come from a previous page"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # One extra row tells whether there is a next page without a COUNT.
+        rows = BookListSerializer(books.order_by("title", "id")[:limit + 1]).data
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1])
+        return Response({
+            "next": next_cursor,
+            "results": rows,
+        }, status=status.HTTP_200_OK)
+
+
+class BookDetailView(ConditionalGetMixin, APIView):
+    cache_models = (Book, Category)
+    shared_cache_timeout = 60 * 5
+
+    def get_etag_stamps(self, request, pk):
+        stamp = catalog_queryset().filter(pk=pk).values_list("updated_at", "category__updated_at").first()
+        if stamp is None:
+            return None
+        return tuple(value.isoformat() if value else "" for value in stamp)
+
+    def get(self, request, pk):
+        book = BookDetailSerializer(catalog_queryset().filter(pk=pk), many=False).data
+        if book is None:
+            return Response(
+                {"detail": "Book not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(book, status=status.HTTP_200_OK)
+